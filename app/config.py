@@ -1,6 +1,7 @@
 # app/config.py
 import os
-from typing import Optional
+import socket
+from typing import Dict, Optional
 from dotenv import load_dotenv
 load_dotenv()  # Load before BaseSettings tries to access anything
 
@@ -20,6 +21,113 @@ class Settings(BaseSettings):
 
     opencage_api_key: str = Field(..., alias="OPENCAGE_API_KEY")
 
+    # SQLAlchemy connection pool (per process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, reopen older connections (server / proxy idle timeouts)
+    DB_POOL_PRE_PING: bool = True  # check connections on checkout, drop dead ones
+    DB_ECHO: bool = False  # log every SQL statement
+    # asyncpg engine for read / health endpoints (DB waits don't hold threadpool slots)
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DB_POOL_SIZE: int = 5
+
+    # Greenhouse validation lane: "single" (one API call per job), "bulk" (one listing call per board)
+    # or "async" (concurrent asyncio requests)
+    GREENHOUSE_VALIDATION_MODE: str = "single"
+    # Boards with fewer pending jobs than this keep using the single-job API in bulk mode
+    GREENHOUSE_BULK_MIN_JOBS_PER_BOARD: int = 2
+    GREENHOUSE_ASYNC_CONCURRENCY: int = 50  # max jobs in flight
+    GREENHOUSE_ASYNC_LIMIT_PER_HOST: int = 10  # max open connections per host
+    GREENHOUSE_ASYNC_TIMEOUT: float = 15  # seconds, per request
+
+    # Per-upstream rate limits (app/utils/rate_limiter.py): token bucket of `rate` req/s with `burst`,
+    # in-flight requests adapted (AIMD) between min_concurrency and max_concurrency on 429s and
+    # responses slower than latency_target seconds. Override with a JSON env var.
+    RATE_LIMIT_ENABLED: bool = True
+    UPSTREAM_LIMITS: Dict[str, Dict[str, float]] = {
+        "greenhouse": {"rate": 20, "burst": 20, "max_concurrency": 20, "latency_target": 3},
+        "comeet": {"rate": 5, "burst": 5, "max_concurrency": 5, "latency_target": 5},
+        "opencage": {"rate": 1, "burst": 1, "max_concurrency": 1, "latency_target": 3},  # free plan: 1 req/s
+        "openai": {"rate": 3, "burst": 5, "max_concurrency": 4, "latency_target": 30},
+    }
+
+    # Location verdict cache (in-process LRU + location_verdicts table)
+    LOCATION_CACHE_MAX_ENTRIES: int = 5000
+    LOCATION_CACHE_TTL_HOURS: float = 24 * 30
+    LOCATION_CACHE_DB_ENABLED: bool = True
+
+    # GPT response cache (gpt_response_cache table)
+    GPT_CACHE_ENABLED: bool = True
+    GPT_CACHE_TTL_HOURS: float = 24 * 7
+    GPT_CACHE_MAX_MB: float = 200
+    GPT_CACHE_EVICT_EVERY: int = 50  # run eviction every N stored responses
+
+    # Chrome profile: "extraction" (blocks images/fonts/media/trackers, eager page load) or "default"
+    CHROME_PROFILE: str = "extraction"
+    CHROME_PAGE_LOAD_TIMEOUT: float = 30  # seconds
+    CHROME_SCRIPT_TIMEOUT: float = 10  # seconds
+
+    # Warm Chrome driver pool owned by the app (0 = launch a browser per request)
+    CHROME_POOL_SIZE: int = 2
+    CHROME_POOL_MAX_PAGES_PER_DRIVER: int = 50  # recycle a driver after N rendered pages (checked between jobs)
+    CHROME_POOL_MAX_RSS_MB: float = 1500  # recycle a driver when its process tree uses more (0 = no check)
+    CHROME_POOL_LEASE_TIMEOUT: float = 60  # seconds to wait for a free driver
+
+    # Try a plain HTTP fetch of Comeet pages (JSON-LD) before starting a browser
+    COMEET_HTTP_FAST_PATH: bool = True
+    # Comeet pages rendered at once as tabs of one browser (1 = one page at a time)
+    COMEET_TABS_PER_BROWSER: int = 1
+    # How Comeet pages are read from the browser: "script" (one in-page extraction call, full
+    # source only pulled for the GPT fallback) or "page_source" (whole page over WebDriver)
+    COMEET_EXTRACTION_MODE: str = "script"
+
+    # /validate-pending walks pending jobs in id order, VALIDATION_BATCH_SIZE rows per page
+    VALIDATION_BATCH_SIZE: int = 50
+    VALIDATION_MAX_JOBS_PER_RUN: Optional[int] = None  # None = drain all pending jobs
+    VALIDATION_RUN_DEADLINE_SECONDS: Optional[float] = None  # stop starting new pages after this long
+
+    # Threads running /validate-pending runs in the background (runs beyond this wait in a queue)
+    VALIDATION_RUN_EXECUTORS: int = 1
+
+    # Pending jobs are claimed with FOR UPDATE SKIP LOCKED leases so several replicas can validate at once
+    JOB_LEASE_ENABLED: bool = True
+    JOB_LEASE_SECONDS: float = 300  # a lease not renewed for this long is reclaimed by other replicas
+    JOB_LEASE_HEARTBEAT_SECONDS: float = 60
+    WORKER_ID: str = f"{socket.gethostname()}-{os.getpid()}"
+
+    # Job updates of /validate-pending are written in batches (see WriteBehindBuffer)
+    WRITE_BEHIND_ENABLED: bool = True
+    WRITE_BEHIND_MAX_ROWS: int = 25  # flush after this many updated jobs
+    WRITE_BEHIND_MAX_DELAY_MS: float = 2000  # or when the oldest buffered update is this old
+
+    # Cleaned job HTML memoized by content hash (app/utils/html_cleaning.py)
+    HTML_CLEAN_CACHE_MAX_ENTRIES: int = 2000
+
+    # /admin/profile and /admin/memory/* (sampling profiler, tracemalloc), need the X-Admin-Token header
+    ADMIN_ENDPOINTS_ENABLED: bool = False
+    ADMIN_TOKEN: Optional[str] = None  # admin endpoints refuse every request until it's set
+    PROFILER_SAMPLE_INTERVAL_MS: float = 10
+    PROFILER_MAX_SECONDS: float = 120  # cap of one profile, also for ?validations=N
+    TRACEMALLOC_FRAMES: int = 10
+    TRACEMALLOC_TOP: int = 25  # allocation sites returned per snapshot / diff
+
+    # Store each validation's stage timings / HTTP / GPT usage in job_posts.validation_timeline
+    JOB_TIMELINE_ENABLED: bool = True
+
+    # Revalidation of valid jobs sends If-None-Match / If-Modified-Since and compares a content hash,
+    # an unchanged posting only gets its validated_date refreshed (see app/services/source_fingerprints.py)
+    CONDITIONAL_REVALIDATION_ENABLED: bool = True
+
+    # Valid jobs are revalidated in priority order within an hourly budget (app/services/revalidation_scheduler.py).
+    # Enable on a single replica
+    REVALIDATION_ENABLED: bool = False
+    REVALIDATION_JOBS_PER_HOUR: int = 200
+    REVALIDATION_TICK_SECONDS: float = 300  # how often the scheduler picks the next jobs
+    REVALIDATION_MIN_INTERVAL_HOURS: float = 24  # jobs validated more recently are not picked
+    REVALIDATION_SOURCE_WEIGHTS: Dict[str, float] = {}  # JobPost.source → priority multiplier (default 1)
+    REVALIDATION_CLOSURE_RATES_TTL_SECONDS: float = 3600  # company closure rates are a full-table GROUP BY, reused this long
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db.session import engine
+from app.log_config import logger
+
+_async_engine: Optional[AsyncEngine] = None
+_async_unavailable = False  # Creating the engine failed once (e.g. asyncpg missing), don't retry
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """The asyncpg engine (created on first use), or None when ASYNC_DB_ENABLED is off or asyncpg is missing."""
+    global _async_engine, _async_unavailable
+    if not settings.ASYNC_DB_ENABLED or _async_unavailable:
+        return None
+    if _async_engine is None:
+        try:
+            url = make_url(str(settings.DATABASE_URL)).set(drivername="postgresql+asyncpg")
+            _async_engine = create_async_engine(
+                url,
+                echo=settings.DB_ECHO,
+                pool_size=settings.ASYNC_DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Async DB engine unavailable, using the sync engine: {e}")
+            _async_unavailable = True
+            return None
+    return _async_engine
+
+
+def _fetch_all_sync(statement) -> List[Dict[str, Any]]:
+    with engine.connect() as connection:
+        return [dict(row._mapping) for row in connection.execute(statement)]
+
+
+async def fetch_all(statement) -> List[Dict[str, Any]]:
+    """
+    Run a read-only statement and return its rows as dicts.
+    Uses the async engine when enabled, otherwise the sync engine on the threadpool.
+    """
+    async_engine = get_async_engine()
+    if async_engine is None:
+        return await run_in_threadpool(_fetch_all_sync, statement)
+    async with async_engine.connect() as connection:
+        result = await connection.execute(statement)
+        return [dict(row._mapping) for row in result]
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
@@ -1,12 +1,93 @@
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from app.config import settings
 
 Base = declarative_base()
-print('****',settings.DATABASE_URL)
-engine = create_engine(str(settings.DATABASE_URL), echo=settings.DEBUG)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics_lock = threading.Lock()
+        self.metrics = {
+            "checkouts": 0,
+            "checkins": 0,
+            "connects": 0,
+            "waits": 0,  # checkouts that waited more than 10 ms
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "checkout_errors": 0,  # pool timeouts and failed connects
+        }
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self.metrics_lock:
+                self.metrics["checkout_errors"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self.metrics_lock:
+                self.metrics["wait_seconds_total"] += waited
+                self.metrics["wait_seconds_max"] = max(self.metrics["wait_seconds_max"], waited)
+                if waited > 0.01:
+                    self.metrics["waits"] += 1
+
+    def recreate(self):
+        # Keep counting across pool recreation (e.g. engine.dispose())
+        pool = super().recreate()
+        pool.metrics, pool.metrics_lock = self.metrics, self.metrics_lock
+        return pool
+
+    def stats(self) -> dict:
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["wait_seconds_total"] = round(metrics["wait_seconds_total"], 3)
+        metrics["wait_seconds_max"] = round(metrics["wait_seconds_max"], 3)
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            **metrics,
+        }
+
+
+engine = create_engine(
+    str(settings.DATABASE_URL),
+    echo=settings.DB_ECHO,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+
+def _count(key):
+    def listener(*args):
+        pool = engine.pool
+        with pool.metrics_lock:
+            pool.metrics[key] += 1
+    return listener
+
+
+event.listen(engine, "checkout", _count("checkouts"))
+event.listen(engine, "checkin", _count("checkins"))
+event.listen(engine, "connect", _count("connects"))
+
+# Keep loaded attributes after commit: the validator commits many times per run, expiring
+# everything on each commit would re-SELECT every job touched afterwards
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def get_db():
     db = SessionLocal()
@@ -14,3 +95,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def pool_stats() -> dict:
+    return engine.pool.stats()
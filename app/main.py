@@ -1,4 +1,9 @@
 import os
+import asyncio
+import secrets
+from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Callable, Iterator, Optional
 from dotenv import load_dotenv
 from openai import OpenAI
 from app.config import settings
@@ -8,7 +13,7 @@ client = OpenAI(api_key=settings.openai_api_key)
 
 
 from app.models.job_post import JobPost
-from app.schemas.job_post_schema import JobPostUpdate, JobValidationResult
+from app.schemas.job_post_schema import JobBatchRequest, JobPostUpdate, JobValidationResult
 from app.utils.chrome_driver_manger import DriverManager
 from app.utils.page_scraper import extract_visible_text_from_url
 from app.validators.factory import ValidatorFactory
@@ -32,14 +37,27 @@ else:
 from app.config import settings
 
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.db.session import get_db
+from app.db.session import get_db, pool_stats
+from app.db.async_session import dispose_async_engine, fetch_all, get_async_engine
 from app.log_config import logger
-from app.services.validation_service import JobValidatorService
+from app.services.validation_service import JobValidatorService, build_validation_result, validation_timelines_available
+from app.services.job_leases import job_leases_available
+from app.services.source_fingerprints import fingerprint_load_options, source_fingerprints_available
+from app.services.validation_runs import ValidationRunManager
+from app.services.revalidation_scheduler import RevalidationScheduler
 from app.db.session import SessionLocal
+from app.utils.location_utils import seed_location_cache
+from app.services.gpt_cache import gpt_cache
+from app.utils.rate_limiter import limiter_stats
+from app.utils.metrics import CONTENT_TYPE_LATEST, render_metrics
+from app.utils.profiling import MemoryProfiler, ProfilerBusyError, SamplingProfiler
+from app.utils.chrome_driver_pool import ChromeDriverPool, set_driver_pool
+from app.validators.comeet_validator import ComeetValidator
 
 os.getcwd()
 print("🔎 settinssgs.DEBUG =", settings.DEBUG)
@@ -59,7 +77,60 @@ if os.getenv("DEBUGPY", "false").lower() == "true":
     except Exception as e:
         print(f"❌ debugpy failed: {e}")
 
-app = FastAPI()
+def warm_location_cache():
+    db = SessionLocal()
+    try:
+        seed_location_cache(db)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not seed location cache: {e}")
+    finally:
+        db.close()
+
+
+def prepare_optional_columns() -> None:
+    """
+    Add the optional job_posts columns before any request or run opens a session on the table:
+    ensure_columns() needs an exclusive lock that an open read transaction of this process would block.
+    """
+    job_leases_available()
+    source_fingerprints_available()
+    validation_timelines_available()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(prepare_optional_columns)
+    await asyncio.to_thread(warm_location_cache)
+
+    driver_pool = None
+    if settings.CHROME_POOL_SIZE > 0:
+        driver_pool = ChromeDriverPool(
+            driver_factory=ComeetValidator._init_driver,
+            size=settings.CHROME_POOL_SIZE,
+            max_pages_per_driver=settings.CHROME_POOL_MAX_PAGES_PER_DRIVER,
+            max_rss_mb=settings.CHROME_POOL_MAX_RSS_MB,
+            lease_timeout=settings.CHROME_POOL_LEASE_TIMEOUT,
+        )
+        await asyncio.to_thread(driver_pool.start)
+        set_driver_pool(driver_pool)
+    app.state.driver_pool = driver_pool
+    app.state.run_manager = ValidationRunManager(executors=settings.VALIDATION_RUN_EXECUTORS)
+    app.state.revalidation = RevalidationScheduler() if settings.REVALIDATION_ENABLED else None
+    if app.state.revalidation:
+        app.state.revalidation.start()
+
+    yield
+
+    if app.state.revalidation:
+        await asyncio.to_thread(app.state.revalidation.stop)
+    await asyncio.to_thread(app.state.run_manager.shutdown)
+    await dispose_async_engine()
+    if driver_pool:
+        set_driver_pool(None)
+        await asyncio.to_thread(driver_pool.shutdown)
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def read_root():
@@ -157,11 +228,12 @@ def extract_job_data_from_url(url: str = Query(..., description="Job posting URL
         raise HTTPException(status_code=500, detail=f"OpenAI error: {e}")
     
 @app.get("/health/db")
-def db_health_check(db: Session = Depends(get_db)):
+async def db_health_check():
     try:
-        can_update = db.execute(text(
-    "SELECT has_column_privilege('job_validator_user', 'job_posts', 'status')"
-)).scalar()
+        rows = await fetch_all(text(
+    "SELECT has_column_privilege('job_validator_user', 'job_posts', 'status') AS can_update"
+))
+        can_update = rows[0]["can_update"] if rows else False
     except Exception as update_err:
         logger.warning(f"⚠️ UPDATE permission check failed: {update_err}")
         can_update = False
@@ -173,16 +245,15 @@ def db_health_check(db: Session = Depends(get_db)):
 
 
 @app.get("/health/db/basic")
-def db_health_check_basic(db: Session = Depends(get_db)):
+async def db_health_check_basic():
     try:
         # Just a simple query to check DB connection
         # result = db.execute(text("SELECT 1"))
-        result = db.execute(text("SELECT * from JOB_POSTS limit 1"))
-        row = result.fetchone()
+        rows = await fetch_all(text("SELECT * from JOB_POSTS limit 1"))
         return {
             "status": "ok",
             "db": "connected",
-            "result": dict(row._mapping) if row else "No rows"
+            "result": rows[0] if rows else "No rows"
         }
 
     except Exception as e:
@@ -190,16 +261,166 @@ def db_health_check_basic(db: Session = Depends(get_db)):
         return {"status": "error", "db": "not connected", "error": str(e)}
 
 
-@app.post("/validate-pending")
-def validate():
-    service = JobValidatorService(None)  # Or pass DB session if you have one
-    results = service.validate_pending_jobs()
-    return {"results": results}
-    
+@app.get("/health/db/pool")
+def db_pool_stats():
+    return {"sync": pool_stats(), "async_enabled": get_async_engine() is not None}
+
+
+@app.get("/health/chrome-pool")
+def chrome_pool_stats():
+    if not app.state.driver_pool:
+        return {"enabled": False}
+    return {"enabled": True, **app.state.driver_pool.stats()}
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: per-stage latency histograms, cache hits, GPT tokens / cost and job statuses."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+profiler = SamplingProfiler(settings.PROFILER_SAMPLE_INTERVAL_MS, settings.PROFILER_MAX_SECONDS)
+memory_profiler = MemoryProfiler(settings.TRACEMALLOC_FRAMES, settings.TRACEMALLOC_TOP)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints are hidden unless ADMIN_ENDPOINTS_ENABLED, and need X-Admin-Token == ADMIN_TOKEN."""
+    if not settings.ADMIN_ENDPOINTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not settings.ADMIN_TOKEN or not x_admin_token or \
+            not secrets.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+def admin_profile(
+    seconds: Optional[float] = Query(None, gt=0, description="Profile for this many seconds (default 10)"),
+    validations: Optional[int] = Query(None, gt=0, description="Or until this many more jobs are validated"),
+):
+    """
+    Sample every thread's stack over the next seconds / validations (capped at PROFILER_MAX_SECONDS)
+    and return a collapsed-stack file for flamegraph.pl or speedscope.
+    """
+    if seconds is None and validations is None:
+        seconds = 10
+    try:
+        result = profiler.profile(seconds=seconds, validations=validations)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    filename = f"profile-{datetime.utcnow():%Y%m%dT%H%M%S}.collapsed"
+    return Response(result["collapsed"], media_type="text/plain", headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Profile-Samples": str(result["samples"]),
+        "X-Profile-Duration-Seconds": str(result["duration_seconds"]),
+        "X-Profile-Validations": str(result["validations"]),
+    })
+
+
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+def admin_memory_status():
+    return memory_profiler.status()
+
+
+@app.post("/admin/memory/start", dependencies=[Depends(require_admin)])
+def admin_memory_start():
+    return memory_profiler.start()
+
+
+@app.post("/admin/memory/stop", dependencies=[Depends(require_admin)])
+def admin_memory_stop():
+    return memory_profiler.stop()
+
+
+@app.post("/admin/memory/snapshot", dependencies=[Depends(require_admin)])
+def admin_memory_snapshot():
+    """Take a tracemalloc snapshot (tracing starts on the first one) and return its top allocation sites."""
+    return memory_profiler.snapshot()
+
+
+@app.get("/admin/memory/diff", dependencies=[Depends(require_admin)])
+def admin_memory_diff(base: str, target: Optional[str] = Query(None, description="Snapshot id, default: a new snapshot")):
+    try:
+        return memory_profiler.diff(base, target)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+
+@app.get("/health/revalidation")
+def revalidation_stats():
+    if not app.state.revalidation:
+        return {"enabled": False}
+    return {"enabled": True, **app.state.revalidation.stats()}
+
+
+@app.get("/health/rate-limits")
+def rate_limit_stats():
+    return {"enabled": settings.RATE_LIMIT_ENABLED, "upstreams": limiter_stats()}
+
+
+@app.get("/health/gpt-cache")
+def gpt_cache_stats():
+    return gpt_cache.stats()
+
+
+@app.post("/validate-pending", status_code=202)
+def validate(
+    greenhouse_mode: Optional[str] = Query(None, description='Greenhouse lane: "single", "bulk" or "async"'),
+    batch_size: Optional[int] = Query(None, ge=1, description="Pending jobs loaded per page"),
+    max_jobs: Optional[int] = Query(None, ge=1, description="Stop after this many jobs"),
+    deadline_seconds: Optional[float] = Query(None, gt=0, description="Stop starting new pages after this many seconds"),
+    after_id: int = Query(0, ge=0, description="Resume after this job id (cursor of a previous run)"),
+    stream: bool = Query(False, description="Run in this request and stream one JobValidationResult per line (NDJSON)"),
+):
+    params = dict(
+        greenhouse_mode=greenhouse_mode,
+        batch_size=batch_size,
+        max_jobs=max_jobs,
+        deadline_seconds=deadline_seconds,
+        after_id=after_id,
+    )
+    if stream:
+        return StreamingResponse(
+            ndjson_results(lambda service: service.iter_pending_results(**params)),
+            media_type="application/x-ndjson",
+            status_code=200,
+        )
+
+    # Runs in the background, poll GET /runs/{run_id} for progress
+    run = app.state.run_manager.submit(**params)
+    return {"run_id": run.id, "state": run.state, "status_url": f"/runs/{run.id}"}
+
+
+@app.get("/runs/{run_id}")
+def get_validation_run(run_id: str):
+    run = app.state.run_manager.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run.to_dict()
+
+
+def ndjson_results(iter_results: Callable[[JobValidatorService], Iterator[JobValidationResult]]):
+    """
+    Stream JobValidationResult objects as NDJSON, one line per job as it completes.
+    Runs on its own session: the response body is produced after the endpoint has returned.
+    """
+    with JobValidatorService(None) as service:
+        for result in iter_results(service):
+            yield result.model_dump_json() + "\n"
+
+
+@app.post("/validate/batch")
+def validate_batch(request: JobBatchRequest):
+    """Validate the given job ids, streaming one JobValidationResult per line (application/x-ndjson)."""
+    return StreamingResponse(
+        ndjson_results(lambda service: service.iter_job_results(request.job_ids, request.greenhouse_mode)),
+        media_type="application/x-ndjson",
+    )
+
+
 @app.post("/validate/{job_id}",response_model=JobValidationResult)
 def validate_specific_job(job_id: int, db: Session = Depends(get_db)):
     # Step 1: Load job from DB
-    job = db.query(JobPost).filter(JobPost.id == job_id).first()
+    job = db.query(JobPost).options(*fingerprint_load_options()).filter(JobPost.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -213,6 +434,7 @@ def validate_specific_job(job_id: int, db: Session = Depends(get_db)):
 
     # Step 4: Use ChromeDriver if needed
     with DriverManager() as driver_manager:
+        service.try_fast_path(validator)
         if validator.uses_driver():
             try:
                 shared_driver = driver_manager.get_or_create(validator)
@@ -222,16 +444,8 @@ def validate_specific_job(job_id: int, db: Session = Depends(get_db)):
                 raise HTTPException(status_code=500, detail="Driver error")
                 
         result = service.validate_job(job, validator)
-        return JobValidationResult(
-            job_id=job.id,
-            validated_by=type(validator).__name__,
-            status=job.status,
-            validated_date=job.validated_date.isoformat() if job.validated_date else None,
-            update_success=result,
-            fields_updated=job.fields_updated or [],
-            notes=job.validation_notes,
-            job_link=service.results[0].get('link') if service.results else job.link,
-        )
+        return build_validation_result(job, validator, result)
+
     
 
 
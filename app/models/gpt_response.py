@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+
+from datetime import datetime
+
+from app.models.job_post import Base
+
+
+# Cached OpenAI chat responses, keyed by sha256 of (model, system prompt, user prompt).
+# See app/services/gpt_cache.py
+class GPTResponseCacheEntry(Base):
+    __tablename__ = "gpt_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False)  # Used for size-based eviction
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
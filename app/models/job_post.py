@@ -1,6 +1,6 @@
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy import Boolean, Column, Integer, String, DateTime, Text
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import declarative_base, deferred
 
 from datetime import datetime
 from typing import Optional
@@ -37,6 +37,18 @@ class JobPost(Base):
     fields_updated = Column(ARRAY(String))
     last_validated_by = Column(String)
     validation_notes = Column(Text)
+    # Stage timings, HTTP / GPT calls of the last validation (app/utils/job_timeline.py), deferred like the lease columns
+    validation_timeline = deferred(Column(JSONB, nullable=True))
 
 
-    is_user_reported = Column(Boolean, default=False)  # Keep for fast filtering
\ No newline at end of file
+    is_user_reported = Column(Boolean, default=False)  # Keep for fast filtering
+
+    # Lease of a pending job by one validator replica (see app/services/job_leases.py).
+    # Deferred: only read in lease queries, and loading a JobPost keeps working where the columns aren't added yet
+    lease_owner = deferred(Column(String, nullable=True))  # WORKER_ID of the replica validating it
+    lease_expires_at = deferred(Column(DateTime, nullable=True))  # UTC, reclaimable by others after this
+    # Fingerprint of the source posting at the last successful validation (see app/services/source_fingerprints.py).
+    # Deferred like the lease columns, loaded with undefer_group("source_fingerprint") where they are used
+    source_etag = deferred(Column(String, nullable=True), group="source_fingerprint")  # ETag response header
+    source_last_modified = deferred(Column(String, nullable=True), group="source_fingerprint")  # Last-Modified header
+    content_hash = deferred(Column(String, nullable=True), group="source_fingerprint")  # sha256 of the posting content
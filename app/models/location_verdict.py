@@ -0,0 +1,17 @@
+from sqlalchemy import Boolean, Column, String, DateTime
+
+from datetime import datetime
+
+from app.models.job_post import Base
+
+
+# Cached answer of "is this location in Israel?" per normalized location string.
+# Second tier of the location cache in app/utils/location_cache.py
+class LocationVerdict(Base):
+    __tablename__ = "location_verdicts"
+
+    normalized_location = Column(String, primary_key=True)
+    in_israel = Column(Boolean, nullable=False)
+    source = Column(String, nullable=False)  # "opencage", "gpt" or "job_posts" (seeded from valid jobs)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True)  # NULL = never expires
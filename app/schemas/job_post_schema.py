@@ -1,6 +1,6 @@
 # schemas/job_post.py
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 from datetime import datetime
 
@@ -47,4 +47,10 @@ class JobValidationResult(BaseModel):
     fields_updated: Optional[List[str]]
     notes: Optional[str]
     job_link: str
+    timeline: Optional[Dict[str, Any]] = None  # JobTimeline.to_dict() of this validation
 
+
+
+class JobBatchRequest(BaseModel):
+    job_ids: List[int] = Field(..., min_length=1)
+    greenhouse_mode: Optional[str] = None  # "single", "bulk" or "async"
@@ -0,0 +1,113 @@
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Iterable, Iterator, Tuple, TypeVar
+
+import aiohttp
+
+from app.config import settings
+from app.log_config import logger
+from app.models.job_post import JobPost
+from app.validators.greenhouse import GreenhouseValidator
+
+T = TypeVar("T")
+
+# Messages from the event loop thread of iterate_in_event_loop()
+_ITEM, _ERROR, _DONE = "item", "error", "done"
+
+
+async def iter_prefetched_greenhouse_validators(
+    items: Iterable[Tuple[JobPost, GreenhouseValidator]],
+    concurrency: int = None,
+    limit_per_host: int = None,
+) -> AsyncIterator[Tuple[JobPost, GreenhouseValidator]]:
+    """
+    Run GreenhouseValidator.prefetch_async() for many jobs concurrently.
+    Yields (job, validator) as soon as each prefetch finishes (not in input order).
+
+    Args:
+        items: (job, validator) pairs.
+        concurrency (int): Max jobs in flight (default: settings.GREENHOUSE_ASYNC_CONCURRENCY).
+        limit_per_host (int): Max open connections per host (default: settings.GREENHOUSE_ASYNC_LIMIT_PER_HOST).
+            Also caps concurrent location lookups.
+    """
+    concurrency = concurrency or settings.GREENHOUSE_ASYNC_CONCURRENCY
+    limit_per_host = limit_per_host or settings.GREENHOUSE_ASYNC_LIMIT_PER_HOST
+
+    semaphore = asyncio.Semaphore(concurrency)
+    geo_semaphore = asyncio.Semaphore(limit_per_host)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=limit_per_host)
+    timeout = aiohttp.ClientTimeout(total=settings.GREENHOUSE_ASYNC_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+        async def prefetch(job: JobPost, validator: GreenhouseValidator):
+            async with semaphore:
+                try:
+                    await validator.prefetch_async(session, geo_semaphore)
+                except Exception as e:
+                    logger.error(f"❌ Async prefetch failed for {job.link}: {e}")
+            return job, validator
+
+        tasks = [asyncio.create_task(prefetch(job, validator)) for job, validator in items]
+        logger.info(f"⚡ Prefetching {len(tasks)} greenhouse jobs (concurrency={concurrency}, per host={limit_per_host})")
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iterate_in_event_loop(async_iterator: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Consume an async iterator from sync code. The iterator runs on a private event loop in its own
+    thread and hands each item over a queue, so requests in flight keep going (and their timeouts
+    stay meaningful) while the caller does blocking work (GPT calls, DB commits) between items.
+    Closing the generator early cancels the iterator and waits for the loop to finish.
+    """
+    items: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+    loop = asyncio.new_event_loop()
+    pump_task: "asyncio.Future" = None
+
+    async def pump():
+        try:
+            async for item in async_iterator:
+                items.put((_ITEM, item))
+        except asyncio.CancelledError:
+            pass
+        except BaseException as e:
+            items.put((_ERROR, e))
+        finally:
+            await async_iterator.aclose()
+            items.put((_DONE, None))
+
+    def run():
+        nonlocal pump_task
+        asyncio.set_event_loop(loop)
+        pump_task = loop.create_task(pump())
+        started.set()
+        try:
+            loop.run_until_complete(pump_task)
+        finally:
+            loop.close()
+
+    started = threading.Event()
+    thread = threading.Thread(target=run, name="async-iterator", daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == _DONE:
+                break
+            if kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        try:
+            loop.call_soon_threadsafe(pump_task.cancel)
+        except RuntimeError:
+            pass  # Loop already finished and closed
+        thread.join()
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.log_config import logger
+from app.models.gpt_response import GPTResponseCacheEntry
+from app.utils.db_utils import ensure_tables
+from app.utils.metrics import record_cache
+
+
+class GPTResponseCache:
+    """
+    Postgres-backed cache of OpenAI chat responses (table gpt_response_cache).
+    Keyed by a hash of (model, system prompt, user prompt), with TTL and size-based eviction
+    (least recently used entries go first once the table is over max_bytes).
+    """
+
+    def __init__(self, ttl_seconds: float, max_bytes: int, evict_every: int = 50, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_eviction = 0
+        self._lock = threading.Lock()
+        self._db_ready: Optional[bool] = None
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str) -> str:
+        payload = json.dumps([model, system_prompt, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss (or if the cache is unavailable)."""
+        if not self._is_available():
+            return None
+        session = SessionLocal()
+        try:
+            entry = session.get(GPTResponseCacheEntry, key)
+            now = datetime.utcnow()
+            if entry is None or (entry.expires_at and entry.expires_at < now):
+                self._count(hit=False)
+                return None
+            session.execute(
+                update(GPTResponseCacheEntry)
+                .where(GPTResponseCacheEntry.key == key)
+                .values(hit_count=GPTResponseCacheEntry.hit_count + 1, last_hit_at=now)
+            )
+            session.commit()
+            self._count(hit=True)
+            return entry.response
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"⚠️ GPT cache lookup failed: {e}")
+            return None
+        finally:
+            session.close()
+
+    def put(self, key: str, model: str, response: str) -> None:
+        if not response or not self._is_available():
+            return
+        session = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            session.merge(GPTResponseCacheEntry(
+                key=key,
+                model=model,
+                response=response,
+                size_bytes=len(response.encode("utf-8")),
+                hit_count=0,
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+            ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"⚠️ Failed to store GPT response in cache: {e}")
+            return
+        finally:
+            session.close()
+
+        with self._lock:
+            self._puts_since_eviction += 1
+            should_evict = self._puts_since_eviction >= self.evict_every
+            if should_evict:
+                self._puts_since_eviction = 0
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete expired entries, then the least recently used ones until the cache fits in max_bytes."""
+        if not self._is_available():
+            return
+        session = SessionLocal()
+        try:
+            expired = session.execute(
+                delete(GPTResponseCacheEntry).where(GPTResponseCacheEntry.expires_at < datetime.utcnow())
+            ).rowcount
+
+            recency = func.coalesce(GPTResponseCacheEntry.last_hit_at, GPTResponseCacheEntry.created_at)
+            ranked = select(
+                GPTResponseCacheEntry.key,
+                func.sum(GPTResponseCacheEntry.size_bytes).over(order_by=recency.desc()).label("running_bytes"),
+            ).subquery()
+            over_size = session.execute(
+                delete(GPTResponseCacheEntry).where(
+                    GPTResponseCacheEntry.key.in_(select(ranked.c.key).where(ranked.c.running_bytes > self.max_bytes))
+                )
+            ).rowcount
+            session.commit()
+            if expired or over_size:
+                logger.info(f"🧹 GPT cache eviction: {expired} expired, {over_size} over size limit")
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"⚠️ GPT cache eviction failed: {e}")
+        finally:
+            session.close()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "available": bool(self._db_ready),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+    def _count(self, hit: bool) -> None:
+        record_cache("gpt", hit)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _is_available(self) -> bool:
+        if not self.enabled:
+            return False
+        if self._db_ready is None:
+            self._db_ready = ensure_tables(GPTResponseCacheEntry.__table__)
+            if not self._db_ready:
+                logger.warning("⚠️ gpt_response_cache table unavailable, GPT responses won't be cached")
+        return self._db_ready
+
+
+gpt_cache = GPTResponseCache(
+    ttl_seconds=settings.GPT_CACHE_TTL_HOURS * 3600,
+    max_bytes=int(settings.GPT_CACHE_MAX_MB * 1024 * 1024),
+    evict_every=settings.GPT_CACHE_EVICT_EVERY,
+    enabled=settings.GPT_CACHE_ENABLED,
+)
@@ -1,32 +1,55 @@
 import json
+from typing import Callable, Optional
 from bs4 import BeautifulSoup
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from app.config import settings
 from app.log_config import logger
+from app.services.gpt_cache import gpt_cache
+from app.utils.rate_limiter import upstream_slot
+from app.utils.metrics import record_gpt_usage, stage_timer
 
 
 client = OpenAI(api_key=settings.openai_api_key)
 
-def call_gpt_chat(prompt: str, model: str = "gpt-3.5-turbo", system_prompt: str = "You are a helpful assistant.") -> str:
+def call_gpt_chat(prompt: str, model: str = "gpt-3.5-turbo", system_prompt: str = "You are a helpful assistant.",
+                  cache_if: Optional[Callable[[str], bool]] = None) -> str:
     """
     Sends a prompt to OpenAI Chat API and returns the content + usage.
+    Responses are cached by (model, system prompt, prompt), see app/services/gpt_cache.py
+    With cache_if, only replies it accepts are cached (and cached ones it rejects are asked again),
+    so a reply the caller can't use isn't repeated for the whole TTL.
 
     Returns:
         content (str): Raw assistant reply
         usage (dict): Token usage details
     """
+    cache_key = gpt_cache.make_key(model, system_prompt, prompt)
+    cached = gpt_cache.get(cache_key)
+    if cached is not None and (cache_if is None or cache_if(cached)):
+        logger.info(f"💾 GPT cache hit ({model})")
+        return cached
+
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0,
-        )
+        with stage_timer("gpt"), upstream_slot("openai") as slot:
+            try:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0,
+                )
+            except RateLimitError:
+                slot.status = 429  # Back off the shared OpenAI limiter
+                raise
         content = response.choices[0].message.content.strip()
         usage = response.usage
         print_token_usage(model, usage)
+        if cache_if is None or cache_if(content):
+            gpt_cache.put(cache_key, model, content)
+        else:
+            logger.warning(f"⚠️ GPT reply not cached, the caller can't use it ({model})")
         return content
 
     except Exception as e:
@@ -37,12 +60,20 @@ def call_gpt_chat(prompt: str, model: str = "gpt-3.5-turbo", system_prompt: str
 
 def print_token_usage(model: str, usage) -> None:
     """
-    Given model name and usage object, prints token count and estimated cost.
+    Given model name and usage object, prints token count and estimated cost
+    (and adds them to the jobintel_gpt_* metrics).
 
     Args:
         model (str): Model used (e.g., "gpt-3.5-turbo", "gpt-4", etc.)
         usage: response.usage object from OpenAI API
     """
+    cost_usd = estimate_gpt_cost(model, usage)
+    record_gpt_usage(model, usage.prompt_tokens, usage.completion_tokens, cost_usd)
+    logger.info(f"💰 GPT used: {usage.total_tokens} tokens → Estimated cost: ${cost_usd:.5f}")
+
+
+def estimate_gpt_cost(model: str, usage) -> float:
+    """Estimated cost in USD of a response.usage of the given model."""
     model = model.lower()
     if model == "gpt-4":
         pricing = {"input": 0.03, "output": 0.06}
@@ -53,12 +84,22 @@ def print_token_usage(model: str, usage) -> None:
     else:
         pricing = {"input": 0.0015, "output": 0.002}  # fallback
 
-    cost_usd = (
+    return (
         usage.prompt_tokens * pricing["input"] +
         usage.completion_tokens * pricing["output"]
     ) / 1000
 
-    logger.info(f"💰 GPT used: {usage.total_tokens} tokens → Estimated cost: ${cost_usd:.5f}")
+def parse_json_reply(content: str) -> dict:
+    """JSON object of a GPT reply, with the ```json fence stripped if present."""
+    return json.loads(content.strip("```json").strip("```"))
+
+
+def is_json_reply(content: str) -> bool:
+    try:
+        return isinstance(parse_json_reply(content), dict)
+    except ValueError:
+        return False
+
 
 def gpt_extract_job_metadata_from_html(html: str,prompt: str = None) -> dict:
     """
@@ -85,9 +126,9 @@ Here's the page content:
 
     try:
         
-        content = call_gpt_chat(prompt, model="gpt-3.5-turbo", system_prompt="You extract structured job data from HTML.")
-        content = content.strip("```json").strip("```")
-        return json.loads(content)
+        content = call_gpt_chat(prompt, model="gpt-3.5-turbo", system_prompt="You extract structured job data from HTML.",
+                                cache_if=is_json_reply)
+        return parse_json_reply(content)
         
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -167,7 +208,7 @@ Job Description:
         print(f"❌ Error summarizing job description: {e}")
         return ""
 
-def classify_location_with_gpt(location: str) -> bool:
+def classify_location_with_gpt(location: str) -> Optional[bool]:
     """
     Uses OpenAI GPT to classify if a given job location is
     return True if the location is in Israel, False otherwise.
@@ -175,6 +216,7 @@ def classify_location_with_gpt(location: str) -> bool:
         location (str): The job location to classify (e.g., "Tel Aviv", "Berlin")   
     Returns:
         bool: True if the location is in israel, False otherwise.
+              None if GPT gave no answer (API error).
     """
     prompt = f"""
     Is the following job location in Israel? Answer only "yes" or "no".
@@ -184,7 +226,9 @@ def classify_location_with_gpt(location: str) -> bool:
     try:
         result = call_gpt_chat(prompt, model="gpt-3.5-turbo")
         answer = result.lower().strip()
+        if not answer:
+            return None
         return "yes" in answer
     except Exception as e:
         logger.error(f"GPT fallback error: {e}")
-        return False
\ No newline at end of file
+        return None  # No answer: not cached, so the location is asked again next time
\ No newline at end of file
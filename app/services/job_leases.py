@@ -0,0 +1,160 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Query
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.log_config import logger
+from app.models.job_post import JobPost
+from app.utils.db_utils import ensure_columns
+
+_columns_ready: Optional[bool] = None
+
+
+def job_leases_available() -> bool:
+    """Leasing is on and the lease columns exist on job_posts (added on first use)."""
+    global _columns_ready
+    if not settings.JOB_LEASE_ENABLED:
+        return False
+    if _columns_ready is None:
+        _columns_ready = ensure_columns(JobPost.__table__, JobPost.lease_owner, JobPost.lease_expires_at)
+        if not _columns_ready:
+            logger.warning("⚠️ job_posts lease columns unavailable, validating without leases")
+    return _columns_ready
+
+
+class JobLeaseManager:
+    """
+    Claims pending jobs for one worker so several replicas never validate the same row.
+
+    A claim is a single UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED): rows another
+    replica is claiming at the same moment are skipped instead of waited on, and rows whose lease
+    expired (a replica died mid-batch) are taken over. A heartbeat thread renews the held leases
+    while their jobs are being validated.
+    """
+
+    def __init__(self, worker_id: str = None, lease_seconds: float = None, heartbeat_seconds: float = None):
+        self.worker_id = worker_id or settings.WORKER_ID
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.heartbeat_seconds = heartbeat_seconds or settings.JOB_LEASE_HEARTBEAT_SECONDS
+        self._held: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.join(timeout=5)
+        self.release_all()
+
+    def claim(self, pending_query: Query, after_id: int, limit: int) -> List[int]:
+        """
+        Lease up to `limit` pending jobs with id > after_id (in id order) to this worker.
+        Args:
+            pending_query: Query of the pending jobs (JobValidatorService.pending_jobs_query()).
+        Returns:
+            list[int]: The claimed job ids, sorted.
+        """
+        now = datetime.utcnow()
+        claimable = (
+            pending_query
+            .filter(
+                JobPost.id > after_id,
+                or_(
+                    JobPost.lease_owner.is_(None),
+                    JobPost.lease_expires_at.is_(None),
+                    JobPost.lease_expires_at < now,
+                    JobPost.lease_owner == self.worker_id,
+                ),
+            )
+            .with_entities(JobPost.id)
+            .order_by(JobPost.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .subquery()
+        )
+        session = SessionLocal()
+        try:
+            claimed = session.execute(
+                update(JobPost)
+                .where(JobPost.id.in_(select(claimable.c.id)))
+                .values(lease_owner=self.worker_id, lease_expires_at=now + timedelta(seconds=self.lease_seconds))
+                .returning(JobPost.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        claimed = sorted(claimed)
+        with self._lock:
+            self._held.update(claimed)
+        if claimed:
+            logger.info(f"🔒 {self.worker_id} leased {len(claimed)} jobs ({claimed[0]}..{claimed[-1]})")
+        return claimed
+
+    def release(self, job_ids: Iterable[int]) -> None:
+        """Give the leases back (jobs still pending become claimable right away)."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        with self._lock:
+            self._held.difference_update(job_ids)
+        session = SessionLocal()
+        try:
+            session.execute(
+                update(JobPost)
+                .where(JobPost.id.in_(job_ids), JobPost.lease_owner == self.worker_id)
+                .values(lease_owner=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"⚠️ Failed to release job leases (they expire on their own): {e}")
+        finally:
+            session.close()
+
+    def release_all(self) -> None:
+        with self._lock:
+            held = list(self._held)
+        self.release(held)
+
+    def renew(self) -> None:
+        """Push the expiry of every held lease forward."""
+        with self._lock:
+            held = list(self._held)
+        if not held:
+            return
+        session = SessionLocal()
+        try:
+            session.execute(
+                update(JobPost)
+                .where(JobPost.id.in_(held), JobPost.lease_owner == self.worker_id)
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            logger.debug(f"💓 Renewed {len(held)} job leases")
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"⚠️ Failed to renew job leases: {e}")
+        finally:
+            session.close()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_seconds):
+            self.renew()
@@ -0,0 +1,211 @@
+import math
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import pytz
+from sqlalchemy import Float, String, case, cast, column, func, literal, or_, select, values
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.log_config import logger
+from app.models.job_post import JobPost
+from app.services.validation_service import JobValidatorService
+
+ISRAEL_TZ = pytz.timezone("Israel")
+CLOSED_STATUSES = ("closed", "validation failed")
+# Companies with few validations get a closure rate pulled towards PRIOR_CLOSURE_RATE,
+# as if they had PRIOR_WEIGHT more validations at that rate
+PRIOR_CLOSURE_RATE = 0.2
+PRIOR_WEIGHT = 5
+MAX_POSTING_AGE_DAYS = 90
+
+
+def priority_score(now: datetime, closure_rate):
+    """
+    SQL expression of a job's revalidation priority (higher first):
+
+        staleness × (1 + posting age / 30 days) × source weight × (1 + 2 × company closure rate)
+
+    staleness is the time since validated_date in units of REVALIDATION_MIN_INTERVAL_HOURS,
+    posting age is capped at MAX_POSTING_AGE_DAYS, the source weight comes from REVALIDATION_SOURCE_WEIGHTS.
+    now and validated_date are naive Israel time, scraped_at (naive UTC) is converted to it.
+    """
+    scraped_at_israel = func.timezone(ISRAEL_TZ.zone, func.timezone("UTC", JobPost.scraped_at))
+    last_validated = func.coalesce(JobPost.validated_date, scraped_at_israel, literal(now))
+    staleness = func.extract("epoch", literal(now) - last_validated) / (settings.REVALIDATION_MIN_INTERVAL_HOURS * 3600)
+    posting_age_days = func.least(
+        func.coalesce(func.extract("epoch", literal(now) - JobPost.posted_time) / 86400, 0), MAX_POSTING_AGE_DAYS
+    )
+    weights = settings.REVALIDATION_SOURCE_WEIGHTS
+    source_weight = case(weights, value=JobPost.source, else_=1.0) if weights else literal(1.0)
+    return (
+        cast(staleness, Float)
+        * (1 + cast(func.greatest(posting_age_days, 0), Float) / 30)
+        * source_weight
+        * (1 + 2 * func.coalesce(closure_rate, PRIOR_CLOSURE_RATE))
+    )
+
+
+def load_company_closure_rates(session: Session) -> Dict[str, float]:
+    """
+    Company → smoothed share of its validated jobs that ended closed / failed.
+    One GROUP BY over all validated jobs, so the scheduler reuses it for REVALIDATION_CLOSURE_RATES_TTL_SECONDS.
+    """
+    closed = func.count().filter(JobPost.status.in_(CLOSED_STATUSES))
+    rows = session.execute(
+        select(
+            JobPost.company,
+            ((cast(closed, Float) + PRIOR_CLOSURE_RATE * PRIOR_WEIGHT) / (func.count() + PRIOR_WEIGHT)).label("closure_rate"),
+        )
+        .where(JobPost.validated.is_(True), JobPost.company.isnot(None))
+        .group_by(JobPost.company)
+    ).all()
+    return {row.company: row.closure_rate for row in rows}
+
+
+def select_revalidation_candidates(session: Session, limit: int, now: datetime = None,
+                                   closure_rates: Dict[str, float] = None) -> List[Dict[str, Any]]:
+    """
+    The `limit` valid jobs most worth revalidating now, best first.
+    Only jobs not validated within REVALIDATION_MIN_INTERVAL_HOURS are considered.
+    closure_rates (see load_company_closure_rates) are loaded here if not given.
+    Returns:
+        list[dict]: {"id", "link", "score"} per job.
+    """
+    now = now or datetime.now(ISRAEL_TZ).replace(tzinfo=None)  # validated_date is stored as naive Israel time
+    cutoff = now - timedelta(hours=settings.REVALIDATION_MIN_INTERVAL_HOURS)
+    if closure_rates is None:
+        closure_rates = load_company_closure_rates(session)
+    rates_table = (
+        values(column("company", String), column("closure_rate", Float), name="closure_rates")
+        .data(list(closure_rates.items()))
+    ) if closure_rates else None
+    score = priority_score(now, rates_table.c.closure_rate if rates_table is not None else None).label("score")
+    query = select(JobPost.id, JobPost.link, score)
+    if rates_table is not None:
+        query = query.outerjoin(rates_table, rates_table.c.company == JobPost.company)
+    rows = session.execute(
+        query
+        .where(
+            JobPost.validated.is_(True),
+            JobPost.status == "valid",
+            or_(JobPost.validated_date.is_(None), JobPost.validated_date < cutoff),
+            JobPost.link.contains("greenhouse") | JobPost.link.contains("comeet"),
+        )
+        .order_by(score.desc(), JobPost.id)
+        .limit(limit)
+    ).all()
+    return [{"id": row.id, "link": row.link, "score": round(row.score or 0, 3)} for row in rows]
+
+
+class RevalidationScheduler:
+    """
+    Keeps valid jobs fresh at a fixed cost: every tick_seconds it revalidates the highest-priority
+    stale jobs (see priority_score), spending at most jobs_per_hour validations per rolling hour.
+    Unchanged Greenhouse postings only refresh validated_date (see source_fingerprints).
+    """
+
+    def __init__(self, jobs_per_hour: int = None, tick_seconds: float = None):
+        self.jobs_per_hour = jobs_per_hour or settings.REVALIDATION_JOBS_PER_HOUR
+        self.tick_seconds = tick_seconds or settings.REVALIDATION_TICK_SECONDS
+        self._spent = deque()  # time.monotonic() of each revalidation in the last hour
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.status_counts = Counter()  # job status after revalidation → jobs, since start
+        self.last_tick_at: Optional[datetime] = None
+        self.last_selected = 0
+        self.last_error: Optional[str] = None
+        self._closure_rates: Optional[Dict[str, float]] = None
+        self._closure_rates_loaded_at = 0.0  # time.monotonic()
+
+    @property
+    def per_tick(self) -> int:
+        """The hourly budget spread evenly over the ticks of an hour."""
+        return max(1, math.ceil(self.jobs_per_hour * self.tick_seconds / 3600))
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="revalidation-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"🗓️ Revalidation scheduler started: {self.jobs_per_hour} jobs/hour, every {self.tick_seconds}s")
+
+    def stop(self) -> None:
+        """Stop after the job being validated (the rest of the tick is skipped)."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=30)
+
+    def remaining_budget(self) -> int:
+        with self._lock:
+            hour_ago = time.monotonic() - 3600
+            while self._spent and self._spent[0] < hour_ago:
+                self._spent.popleft()
+            return max(0, self.jobs_per_hour - len(self._spent))
+
+    def tick(self) -> int:
+        """Revalidate the next batch of jobs within the budget. Returns the number of jobs revalidated."""
+        self.last_tick_at = datetime.utcnow()
+        limit = min(self.per_tick, self.remaining_budget())
+        if not limit:
+            logger.debug("🗓️ Revalidation budget spent for this hour")
+            return 0
+
+        session = SessionLocal()
+        try:
+            candidates = select_revalidation_candidates(session, limit, closure_rates=self.closure_rates(session))
+        finally:
+            session.close()
+        self.last_selected = len(candidates)
+        if not candidates:
+            return 0
+        logger.info(f"🗓️ Revalidating {len(candidates)} jobs (top score {candidates[0]['score']})")
+
+        done = 0
+        with JobValidatorService(None) as service:
+            for result in service.iter_job_results([candidate["id"] for candidate in candidates]):
+                with self._lock:
+                    self._spent.append(time.monotonic())
+                    self.status_counts[result.status or "pending"] += 1
+                done += 1
+                if self._stop.is_set():
+                    break
+        return done
+
+    def closure_rates(self, session: Session) -> Dict[str, float]:
+        """Company closure rates, reloaded at most every REVALIDATION_CLOSURE_RATES_TTL_SECONDS."""
+        if self._closure_rates is None or \
+                time.monotonic() - self._closure_rates_loaded_at >= settings.REVALIDATION_CLOSURE_RATES_TTL_SECONDS:
+            self._closure_rates = load_company_closure_rates(session)
+            self._closure_rates_loaded_at = time.monotonic()
+            logger.debug(f"🗓️ Loaded closure rates of {len(self._closure_rates)} companies")
+        return self._closure_rates
+
+    def stats(self) -> Dict[str, Any]:
+        remaining = self.remaining_budget()
+        with self._lock:
+            return {
+                "running": bool(self._thread and self._thread.is_alive()),
+                "jobs_per_hour": self.jobs_per_hour,
+                "tick_seconds": self.tick_seconds,
+                "spent_last_hour": len(self._spent),
+                "remaining_budget": remaining,
+                "last_tick_at": self.last_tick_at,
+                "last_selected": self.last_selected,
+                "last_error": self.last_error,
+                "status_counts": dict(self.status_counts),
+            }
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception(f"❌ Revalidation tick failed: {e}")
+            self._stop.wait(self.tick_seconds)
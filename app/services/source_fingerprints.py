@@ -0,0 +1,79 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy.orm import undefer_group
+
+from app.config import settings
+from app.log_config import logger
+from app.models.job_post import JobPost
+from app.utils.db_utils import ensure_columns
+
+_columns_ready: Optional[bool] = None
+
+
+class SourceFingerprint(NamedTuple):
+    etag: Optional[str] = None  # ETag response header of the source
+    last_modified: Optional[str] = None  # Last-Modified response header of the source
+    content_hash: Optional[str] = None  # content_hash() of the posting fields that matter for validation
+
+
+def content_hash(data: Dict[str, Any], fields: Iterable[str]) -> str:
+    """sha256 of the given fields of a JSON posting (key order and other fields don't matter)."""
+    payload = json.dumps({field: data.get(field) for field in fields}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def conditional_headers(fingerprint: Optional[SourceFingerprint]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for a conditional GET, empty without a stored fingerprint."""
+    headers = {}
+    if fingerprint and fingerprint.etag:
+        headers["If-None-Match"] = fingerprint.etag
+    if fingerprint and fingerprint.last_modified:
+        headers["If-Modified-Since"] = fingerprint.last_modified
+    return headers
+
+
+def source_fingerprints_available() -> bool:
+    """
+    Conditional revalidation is on and the fingerprint columns exist on job_posts
+    (added at startup, see main.prepare_optional_columns).
+    """
+    global _columns_ready
+    if not settings.CONDITIONAL_REVALIDATION_ENABLED:
+        return False
+    if _columns_ready is None:
+        _columns_ready = ensure_columns(
+            JobPost.__table__, JobPost.source_etag, JobPost.source_last_modified, JobPost.content_hash
+        )
+        if not _columns_ready:
+            logger.warning("⚠️ job_posts fingerprint columns unavailable, revalidating without fingerprints")
+    return _columns_ready
+
+
+def fingerprint_load_options() -> list:
+    """Query options loading the fingerprint columns with the jobs (none when they are unavailable)."""
+    return [undefer_group("source_fingerprint")] if source_fingerprints_available() else []
+
+
+def attach_source_fingerprint(job: JobPost, validator) -> None:
+    """
+    Give a validator that supports conditional requests (has previous_fingerprint) the fingerprint
+    stored at the job's last successful validation. Only valid jobs are compared, anything else
+    is always validated in full.
+    """
+    if not hasattr(validator, "previous_fingerprint") or validator.previous_fingerprint is not None:
+        return
+    if job.status != "valid" or not source_fingerprints_available():
+        return
+    validator.previous_fingerprint = SourceFingerprint(job.source_etag, job.source_last_modified, job.content_hash)
+
+
+def store_source_fingerprint(job: JobPost, validator) -> None:
+    """Save the validator's fingerprint of the source on the job (call inside the persist block)."""
+    fingerprint: Optional[SourceFingerprint] = getattr(validator, "fingerprint", None)
+    if fingerprint is None or not source_fingerprints_available():
+        return
+    job.source_etag = fingerprint.etag
+    job.source_last_modified = fingerprint.last_modified
+    job.content_hash = fingerprint.content_hash
@@ -0,0 +1,107 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.log_config import logger
+from app.services.validation_service import JobValidatorService
+
+
+class ValidationRun:
+    """One /validate-pending run executed in the background, with live progress from its service."""
+
+    def __init__(self, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.state = "queued"  # queued → running → completed | stopped | failed
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._started_monotonic: Optional[float] = None
+        self._finished_monotonic: Optional[float] = None
+        self.service: Optional[JobValidatorService] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        summary = self.service.summary() if self.service else {}
+        progress = summary.get("progress", {})
+        status_counts = summary.get("status_counts", {})
+        elapsed = None
+        if self._started_monotonic is not None:
+            elapsed = (self._finished_monotonic or time.monotonic()) - self._started_monotonic
+        processed = progress.get("processed", 0)
+        return {
+            "run_id": self.id,
+            "state": self.state,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "progress": progress,
+            "status_counts": status_counts,
+            "elapsed_seconds": round(elapsed, 1) if elapsed is not None else None,
+            "jobs_per_minute": round(processed / elapsed * 60, 1) if elapsed else None,
+        }
+
+
+class ValidationRunManager:
+    """
+    Runs validate_pending_jobs() on a fixed pool of executor threads, so requests only submit work.
+    Keeps the last max_history runs for GET /runs/{id}.
+    """
+
+    def __init__(self, executors: int, max_history: int = 100):
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=executors, thread_name_prefix="validation-run")
+        self._runs: "OrderedDict[str, ValidationRun]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()  # Checked by running runs between pages
+
+    def submit(self, **params) -> ValidationRun:
+        run = ValidationRun(params)
+        with self._lock:
+            self._runs[run.id] = run
+            self._trim_history()
+        self._executor.submit(self._execute, run)
+        logger.info(f"📥 Validation run {run.id} queued with {params}")
+        return run
+
+    def get(self, run_id: str) -> Optional[ValidationRun]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting runs: queued runs are dropped, running ones stop after their current page.
+        Blocks until they did, so the Chrome pool and the DB engine can be shut down afterwards.
+        """
+        self._stop.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _execute(self, run: ValidationRun) -> None:
+        run.service = JobValidatorService(None)  # Owns its session, closed below
+        run.service.stop_event = self._stop
+        run.state = "running"
+        run.started_at = datetime.utcnow()
+        run._started_monotonic = time.monotonic()
+        try:
+            run.service.validate_pending_jobs(**run.params)
+            run.state = "stopped" if self._stop.is_set() and not run.service.progress["done"] else "completed"
+        except Exception as e:
+            run.state = "failed"
+            run.error = str(e)
+            logger.exception(f"❌ Validation run {run.id} failed: {e}")
+        finally:
+            run.finished_at = datetime.utcnow()
+            run._finished_monotonic = time.monotonic()
+            run.service.close()
+            logger.info(f"🏁 Validation run {run.id} {run.state}: {run.service.progress}")
+
+    def _trim_history(self) -> None:
+        finished = [run_id for run_id, run in self._runs.items() if run.state in ("completed", "stopped", "failed")]
+        for run_id in finished[:max(0, len(self._runs) - self.max_history)]:
+            del self._runs[run_id]
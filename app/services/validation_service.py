@@ -1,3 +1,8 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+import threading
+import time
+from typing import Iterator
 from sqlalchemy.orm import Session
 from datetime import datetime
 import pytz
@@ -5,23 +10,110 @@ from urllib.parse import urlparse
 from pydantic import ValidationError
 
 
-from app.schemas.job_post_schema import JobPostUpdate
+from app.schemas.job_post_schema import JobPostUpdate, JobValidationResult
 from app.models.job_post import JobPost
 from app.db.session import SessionLocal
 from app.validators.factory import ValidatorFactory
+from app.validators.greenhouse import GreenhouseValidator
+from app.validators.comeet_validator import ComeetValidator
+from app.validators.comeet_tabs import ComeetTabRenderer
 from app.config import settings
 from app.log_config import logger  
-from app.utils.db_utils import commit_or_rollback
+from app.utils.db_utils import WriteBehindBuffer, commit_or_rollback, ensure_columns
 from app.utils.chrome_driver_manger import DriverManager
+from app.utils.metrics import record_job_status, validator_context
+from app.utils.job_timeline import current_timeline, timeline_context
 from app.exceptions.exceptions import LocationValidationError
+from app.services.job_leases import JobLeaseManager, job_leases_available
+from app.services.source_fingerprints import (
+    attach_source_fingerprint, fingerprint_load_options, store_source_fingerprint,
+)
+from app.services.async_greenhouse import iter_prefetched_greenhouse_validators, iterate_in_event_loop
+
+_timeline_column_ready = None
+
+
+def validation_timelines_available() -> bool:
+    """Timelines are on and job_posts.validation_timeline exists (added at startup, see main.prepare_optional_columns)."""
+    global _timeline_column_ready
+    if not settings.JOB_TIMELINE_ENABLED:
+        return False
+    if _timeline_column_ready is None:
+        _timeline_column_ready = ensure_columns(JobPost.__table__, JobPost.validation_timeline)
+        if not _timeline_column_ready:
+            logger.warning("⚠️ job_posts.validation_timeline unavailable, timelines are only returned in results")
+    return _timeline_column_ready
+
+
+def build_validation_result(job: JobPost, validator, is_valid: bool) -> JobValidationResult:
+    return JobValidationResult(
+        job_id=job.id,
+        validated_by=type(validator).__name__ if validator else None,
+        status=job.status,
+        validated_date=job.validated_date.isoformat() if job.validated_date else None,
+        update_success=is_valid,
+        fields_updated=job.fields_updated or [],
+        notes=job.validation_notes,
+        job_link=job.link,
+        timeline=validator.timeline.to_dict() if validator else None,
+    )
 
 
 #TODO:INJECT DEPENDS(get_db)?
 class JobValidatorService:
     def __init__(self, db_session):
+        # A session opened here is owned by the service and closed by close() / the with-block
+        self._owns_session = db_session is None
         self.db = db_session or SessionLocal()
-        self.results = []
         self.israel_tz = pytz.timezone("Israel")
+        self.progress = {"cursor": 0, "processed": 0, "pages": 0, "done": False}
+        self.status_counts = Counter()  # job status → jobs, for the pages processed so far
+        self._progress_lock = threading.Lock()  # progress / status_counts are read from other threads (summary())
+        self.stop_event: threading.Event = None  # Set by the owner to stop a pending run between pages
+        self.write_buffer: WriteBehindBuffer = None  # Set for the duration of validate_pending_jobs()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.db.close()
+
+    @contextmanager
+    def persist(self, job: JobPost):
+        """
+        Save the changes made to the job in the with-block: buffered when a write-behind
+        buffer is active, committed right away otherwise.
+        """
+        if self.write_buffer is None:
+            with commit_or_rollback(self.db, job):
+                yield
+                self.store_timeline(job)
+            record_job_status(job.status)
+            return
+        try:
+            yield
+            self.store_timeline(job)
+            self.write_buffer.add(job)
+        except Exception as e:
+            job.status = "commit_error"
+            job.validated_date = datetime.now(self.israel_tz)
+            logger.exception(f"❌ Commit failed for {job.link}: {e}")
+        record_job_status(job.status)
+
+    @staticmethod
+    def store_timeline(job: JobPost) -> None:
+        """Save the running validation's timeline (up to this write) on the job."""
+        timeline = current_timeline.get()
+        if timeline is not None and validation_timelines_available():
+            job.validation_timeline = timeline.to_dict()
+
+    def flush_writes(self) -> None:
+        if self.write_buffer is not None:
+            self.write_buffer.flush()
 
     def is_company_page(self, url: str) -> bool:
         """
@@ -34,96 +126,389 @@ class JobValidatorService:
             return True
         return False
         
-    def validate_pending_jobs(self):
-        """
-        Validate pending jobs in the database.
-        """
-
-        pending_jobs = self.db.query(JobPost).filter(
+    def pending_jobs_query(self):
+        return self.db.query(JobPost).filter(
             JobPost.validated.is_(False),
             JobPost.status == "pending",
             JobPost.link.contains("greenhouse") | JobPost.link.contains("comeet"),
             # Updated filter to include both "greenhouse" and "comeet" links
-        ).limit(2).all()
+        )
 
-        # pending_jobs = self.db.query(JobPost).filter(
-        #     JobPost.id == 99,
-        # ).limit(2).all()
-        
-        # pending_jobs = self.db.query(JobPost).filter(
-        #     JobPost.link == "https://www.comeet.com/jobs/drivenets/72.006/full-stack-team-leader-node_js--react/A1.456"
-        # ).limit(2).all()
+    def iter_pending_job_pages(self, batch_size: int, after_id: int = 0, max_jobs: int = None, deadline: float = None,
+                               leases: JobLeaseManager = None):
+        """
+        Walk pending jobs in id order with keyset pagination (WHERE id > cursor ORDER BY id LIMIT batch_size).
+        Each page is loaded on its own, so memory stays bounded by batch_size whatever the backlog size,
+        and rows left pending by an error are not picked up again in the same run.
+        With leases, each page is claimed for this worker first (jobs leased by other replicas are skipped)
+        and released once done.
+        Stops after max_jobs jobs, at the deadline (time.monotonic()) or once stop_event is set, checked between pages.
+        Yields lists of JobPost.
+        """
+        cursor = after_id
+        while True:
+            if self.stop_event is not None and self.stop_event.is_set():
+                logger.info(f"⏹️ Run stopped, stopping at cursor {cursor}")
+                return
+            remaining = None if max_jobs is None else max_jobs - self.progress["processed"]
+            if remaining is not None and remaining <= 0:
+                logger.info(f"⏹️ Reached max_jobs={max_jobs}, stopping at cursor {cursor}")
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.info(f"⏹️ Run deadline reached, stopping at cursor {cursor}")
+                return
+
+            limit = batch_size if remaining is None else min(batch_size, remaining)
+            if leases:
+                claimed_ids = leases.claim(self.pending_jobs_query(), cursor, limit)
+                page = (
+                    self.db.query(JobPost)
+                    .options(*fingerprint_load_options())
+                    .filter(JobPost.id.in_(claimed_ids))
+                    .order_by(JobPost.id)
+                    .all()
+                ) if claimed_ids else []
+            else:
+                page = (
+                    self.pending_jobs_query()
+                    .options(*fingerprint_load_options())
+                    .filter(JobPost.id > cursor)
+                    .order_by(JobPost.id)
+                    .limit(limit)
+                    .all()
+                )
+            if not page:
+                with self._progress_lock:
+                    self.progress["done"] = True
+                return
+            try:
+                yield page
+            finally:
+                # Write the page's results before other replicas can claim its leftovers
+                self.flush_writes()
+                if leases:
+                    leases.release(claimed_ids)
+            cursor = page[-1].id
+
+            # The whole page is done (every lane finished): move the resume point past it
+            self.record_page(page, cursor)
+            logger.info(f"📄 Page {self.progress['pages']} done: {self.progress['processed']} jobs, cursor {cursor}")
+            # Validated rows were committed, drop them from the session so it doesn't grow with the run
+            self.db.expunge_all()
 
-        if not pending_jobs:
+    def validate_pending_jobs(self, greenhouse_mode: str = None, batch_size: int = None, max_jobs: int = None,
+                              deadline_seconds: float = None, after_id: int = 0):
+        """
+        Validate pending jobs in the database, page by page (see iter_pending_job_pages).
+        Args:
+            greenhouse_mode (str): "single", "bulk" or "async" for greenhouse jobs (default: settings.GREENHOUSE_VALIDATION_MODE).
+            batch_size (int): Jobs per page (default: settings.VALIDATION_BATCH_SIZE).
+            max_jobs (int): Stop after this many jobs (default: settings.VALIDATION_MAX_JOBS_PER_RUN, None = all).
+            deadline_seconds (float): Stop starting new pages after this many seconds
+                (default: settings.VALIDATION_RUN_DEADLINE_SECONDS, None = no limit).
+            after_id (int): Resume after this job id (the cursor of an interrupted run).
+        Progress (cursor, processed, pages, done) is kept in self.progress.
+        Returns:
+            dict: The run summary (progress and per-status totals), results are not kept in memory.
+        """
+        for _ in self.iter_pending_results(greenhouse_mode, batch_size, max_jobs, deadline_seconds, after_id):
+            pass
+        if not self.progress["processed"]:
             logger.error("No pending jobs to validate.")
-            return
-        
-        with DriverManager() as driver_manager:
-            for job in pending_jobs:
-                logger.info(f"🔍 Validating: {job.link} id: {job.id}")
-                
+        return self.summary()
+
+    def iter_pending_results(self, greenhouse_mode: str = None, batch_size: int = None, max_jobs: int = None,
+                             deadline_seconds: float = None, after_id: int = 0) -> Iterator[JobValidationResult]:
+        """
+        Same run as validate_pending_jobs(), yielding one JobValidationResult as each job completes.
+        """
+        greenhouse_mode = greenhouse_mode or settings.GREENHOUSE_VALIDATION_MODE
+        batch_size = batch_size or settings.VALIDATION_BATCH_SIZE
+        max_jobs = max_jobs if max_jobs is not None else settings.VALIDATION_MAX_JOBS_PER_RUN
+        deadline_seconds = deadline_seconds if deadline_seconds is not None else settings.VALIDATION_RUN_DEADLINE_SECONDS
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self.reset_progress(after_id)
+
+        leases = JobLeaseManager() if job_leases_available() else None
+        with self.batch_context(leases) as driver_manager:
+            for pending_jobs in self.iter_pending_job_pages(batch_size, after_id, max_jobs, deadline, leases):
+                for job, validator, is_valid in self.iter_validate_jobs_page(pending_jobs, greenhouse_mode, driver_manager):
+                    yield build_validation_result(job, validator, is_valid)
+
+    def iter_job_results(self, job_ids: list[int], greenhouse_mode: str = None,
+                         batch_size: int = None) -> Iterator[JobValidationResult]:
+        """
+        Validate the given jobs (whatever their status) batch_size at a time,
+        yielding one JobValidationResult as each job completes. Unknown ids get a "not found" result.
+        """
+        greenhouse_mode = greenhouse_mode or settings.GREENHOUSE_VALIDATION_MODE
+        batch_size = batch_size or settings.VALIDATION_BATCH_SIZE
+        job_ids = list(dict.fromkeys(job_ids))  # Drop duplicates, keep order
+        self.reset_progress()
+
+        with self.batch_context() as driver_manager:
+            for start in range(0, len(job_ids), batch_size):
+                chunk = job_ids[start:start + batch_size]
+                page = (
+                    self.db.query(JobPost)
+                    .options(*fingerprint_load_options())
+                    .filter(JobPost.id.in_(chunk))
+                    .order_by(JobPost.id)
+                    .all()
+                )
+                for job_id in sorted(set(chunk) - {job.id for job in page}):
+                    yield JobValidationResult(job_id=job_id, validated_by=None, status="not found",
+                                              validated_date=None, update_success=False, fields_updated=[],
+                                              notes="Job not found", job_link="")
                 try:
-                    validator = ValidatorFactory.create_validator(job.link)
+                    for job, validator, is_valid in self.iter_validate_jobs_page(page, greenhouse_mode, driver_manager):
+                        yield build_validation_result(job, validator, is_valid)
+                finally:
+                    self.flush_writes()
+                self.record_page(page)
+                self.db.expunge_all()
+            with self._progress_lock:
+                self.progress["done"] = True
+
+    @contextmanager
+    def batch_context(self, leases: JobLeaseManager = None):
+        """Shared driver manager, write-behind buffer (flushed on exit) and lease heartbeat of a batch run."""
+        if settings.WRITE_BEHIND_ENABLED:
+            self.write_buffer = WriteBehindBuffer(
+                self.db, settings.WRITE_BEHIND_MAX_ROWS, settings.WRITE_BEHIND_MAX_DELAY_MS
+            )
+        try:
+            with DriverManager() as driver_manager, leases or nullcontext():
+                yield driver_manager
+        finally:
+            self.flush_writes()
+            self.write_buffer = None
+
+    def reset_progress(self, cursor: int = 0) -> None:
+        with self._progress_lock:
+            self.progress = {"cursor": cursor, "processed": 0, "pages": 0, "done": False}
+            self.status_counts.clear()
+
+    def record_page(self, page: list[JobPost], cursor: int = None) -> None:
+        """Count a finished page in progress / status_counts (and move the cursor past it, if given)."""
+        with self._progress_lock:
+            if cursor is not None:
+                self.progress["cursor"] = cursor
+            self.progress["processed"] += len(page)
+            self.status_counts.update(job.status or "pending" for job in page)
+            self.progress["pages"] += 1
+
+    def summary(self) -> dict:
+        """Snapshot of progress and per-status totals, safe to call while a run updates them."""
+        with self._progress_lock:
+            return {"progress": dict(self.progress), "status_counts": dict(self.status_counts)}
+
+    def iter_validate_jobs_page(self, pending_jobs: list[JobPost], greenhouse_mode: str, driver_manager: DriverManager):
+        """
+        Validate one page of jobs through the greenhouse / comeet lanes and the sequential loop.
+        Yields (job, validator, is_valid) as each job completes (validator is None when none could be created).
+        """
+        if greenhouse_mode in ("bulk", "async"):
+            greenhouse_jobs = [job for job in pending_jobs if self.is_greenhouse_link(job.link)]
+            pending_jobs = [job for job in pending_jobs if not self.is_greenhouse_link(job.link)]
+            if greenhouse_mode == "bulk":
+                greenhouse_results = self.iter_greenhouse_jobs_bulk(greenhouse_jobs)
+            else:
+                greenhouse_results = self.iter_greenhouse_jobs_async(greenhouse_jobs)
+            for job, validator, is_valid in greenhouse_results:
+                self.log_validation_outcome(job, validator, is_valid)
+                yield job, validator, is_valid
+
+        if settings.COMEET_TABS_PER_BROWSER > 1:
+            comeet_jobs = [job for job in pending_jobs if self.is_comeet_link(job.link)]
+            pending_jobs = [job for job in pending_jobs if not self.is_comeet_link(job.link)]
+            for job, validator, is_valid in self.iter_comeet_jobs_in_tabs(comeet_jobs, driver_manager):
+                self.log_validation_outcome(job, validator, is_valid)
+                yield job, validator, is_valid
+
+        for job in pending_jobs:
+            logger.info(f"🔍 Validating: {job.link} id: {job.id}")
+            
+            try:
+                validator = ValidatorFactory.create_validator(job.link)
+            except Exception as e:
+                logger.warning(f"❌ No validator implemented for: {job.link}")
+                with self.persist(job):
+                    job.validated = True
+                    job.status = "no validator"
+                    job.validated_date = datetime.now(self.israel_tz)
+                yield job, None, False
+                continue
+            if not validator:
+                logger.warning(f"⚠️ No validator for: {job.link}")
+                with self.persist(job):
+                    job.validated = True
+                    job.status = "no validator error"
+                    job.validated_date = datetime.now(self.israel_tz)
+                yield job, None, False
+                continue
+            # if (validator.url_is_company_page(job.link)): #fix for greenhouse company pages
+            #     logger.info(f"Company page detected in: {job.link}")
+            #     with self.persist(job):
+            #         job.status = "company page"
+            #         job.validated_date = datetime.now(self.israel_tz)
+            #     continue
+            self.try_fast_path(validator)
+            if validator.uses_driver():
+                try:
+                    shared_driver = driver_manager.get_or_create(validator)
+                    validator.set_driver(shared_driver)
                 except Exception as e:
-                    logger.warning(f"❌ No validator implemented for: {job.link}")
-                    with commit_or_rollback(self.db, job):
-                        job.validated = True
-                        job.status = "no validator"
-                        job.validated_date = datetime.now(self.israel_tz)
-                    continue
-                if not validator:
-                    logger.warning(f"⚠️ No validator for: {job.link}")
-                    with commit_or_rollback(self.db, job):
+                    logger.error(f"🚫 Could not attach driver: {e}")
+                    with self.persist(job):
                         job.validated = True
-                        job.status = "no validator error"
+                        job.status = "driver error"
                         job.validated_date = datetime.now(self.israel_tz)
+                    yield job, validator, False
                     continue
-                # if (validator.url_is_company_page(job.link)): #fix for greenhouse company pages
-                #     logger.info(f"Company page detected in: {job.link}")
-                #     with commit_or_rollback(self.db, job):
-                #         job.status = "company page"
-                #         job.validated_date = datetime.now(self.israel_tz)
-                #     continue
-                if validator.uses_driver():
-                    try:
-                        shared_driver = driver_manager.get_or_create(validator)
-                        validator.set_driver(shared_driver)
-                    except Exception as e:
-                        logger.error(f"🚫 Could not attach driver: {e}")
-                        with commit_or_rollback(self.db, job):
-                            job.validated = True
-                            job.status = "driver error"
-                            job.validated_date = datetime.now(self.israel_tz)
-                        continue
-                    
-                if not self.validate_job(job, validator):
-                    logger.warning(f"❌ Job validation failed: {job.link} id: {job.id} job.status: {job.status} error reason: {job.error_reason}")
-                else:
-                    logger.info(f"✅ Job validated: {job.link} id: {job.id}")
-            return self.results
+                
+            is_valid = self.validate_job(job, validator)
+            self.log_validation_outcome(job, validator, is_valid)
+            yield job, validator, is_valid
+
+    @staticmethod
+    def is_greenhouse_link(link: str) -> bool:
+        return "greenhouse.io" in urlparse(link or "").netloc
+
+    @staticmethod
+    def is_comeet_link(link: str) -> bool:
+        return "comeet.com" in urlparse(link or "").netloc
+
+    @staticmethod
+    def log_validation_outcome(job: JobPost, validator, is_valid: bool) -> None:
+        if is_valid:
+            logger.info(f"✅ Job validated: {job.link} id: {job.id}")
+        else:
+            logger.warning(f"❌ Job validation failed: {job.link} id: {job.id} job.status: {job.status} error reason: {validator.error_reason}")
+
+    def iter_greenhouse_jobs_bulk(self, jobs: list[JobPost]):
+        """
+        Validate greenhouse jobs board by board.
+        Each board listing is fetched once and every job of that board is validated from it,
+        jobs missing from the listing are closed without a per-job request.
+        Boards with a single job or a failed listing fall back to the single-job API path.
+        Yields (job, validator, is_valid) per job.
+        """
+        jobs_by_board = defaultdict(list)
+        for job in jobs:
+            validator = GreenhouseValidator(job.link)
+            attach_source_fingerprint(job, validator)
+            jobs_by_board[validator.get_board_token()].append((job, validator))
+
+        for board_token, board_jobs in jobs_by_board.items():
+            listing = None
+            if board_token and len(board_jobs) >= settings.GREENHOUSE_BULK_MIN_JOBS_PER_BOARD:
+                listing = GreenhouseValidator.fetch_board_listing(board_token)
+            if listing is None:
+                logger.info(f"↩️ Single-job fallback for {len(board_jobs)} jobs of board '{board_token}'")
+
+            for job, validator in board_jobs:
+                logger.info(f"🔍 Validating: {job.link} id: {job.id}")
+                if listing is not None:
+                    validator.apply_board_listing(listing)
+                yield job, validator, self.validate_job(job, validator)
+
+    def iter_greenhouse_jobs_async(self, jobs: list[JobPost]):
+        """
+        Validate greenhouse jobs with concurrent asyncio requests.
+        The network work runs concurrently on an event loop in its own thread (it keeps going while
+        this thread extracts and persists), DB updates stay in this thread, in the order the jobs finish.
+        Yields (job, validator, is_valid) per job.
+        """
+        items = [(job, GreenhouseValidator(job.link)) for job in jobs]
+        for job, validator in items:
+            attach_source_fingerprint(job, validator)
+        prefetched = iterate_in_event_loop(iter_prefetched_greenhouse_validators(items))
+        for job, validator in prefetched:
+            logger.info(f"🔍 Validating: {job.link} id: {job.id}")
+            yield job, validator, self.validate_job(job, validator)
+
+    def iter_comeet_jobs_in_tabs(self, jobs: list[JobPost], driver_manager: DriverManager):
+        """
+        Validate comeet jobs COMEET_TABS_PER_BROWSER at a time, as tabs of one shared browser.
+        Jobs served by the HTTP fast path are validated first, without a browser.
+        Yields (job, validator, is_valid) in the order the pages finish loading.
+        """
+        items = []
+        for job in jobs:
+            validator = ComeetValidator(job.link)
+            self.try_fast_path(validator)
+            if validator.uses_driver():
+                items.append((job, validator))
+            else:
+                logger.info(f"🔍 Validating: {job.link} id: {job.id}")
+                yield job, validator, self.validate_job(job, validator)
+        if not items:
+            return
+
+        try:
+            driver = driver_manager.get_or_create(items[0][1])
+        except Exception as e:
+            logger.error(f"🚫 Could not attach driver: {e}")
+            for job, validator in items:
+                with self.persist(job):
+                    job.validated = True
+                    job.status = "driver error"
+                    job.validated_date = datetime.now(self.israel_tz)
+                yield job, validator, False
+            return
+
+        renderer = ComeetTabRenderer(
+            driver, tabs=settings.COMEET_TABS_PER_BROWSER,
+            needs_new_driver=lambda: driver_manager.needs_refresh(items[0][1]),
+            new_driver=lambda: driver_manager.refresh(items[0][1]),
+        )
+        for job, validator in renderer.render(items):
+            logger.info(f"🔍 Validating: {job.link} id: {job.id}")
+            yield job, validator, self.validate_job(job, validator)
+
+    @staticmethod
+    def try_fast_path(validator) -> None:
+        """
+        Let a Comeet validator try the plain HTTP fetch before a browser is attached
+        (see ComeetValidator.try_http_fast_path). uses_driver() is False afterwards if it worked.
+        """
+        if not settings.COMEET_HTTP_FAST_PATH or not isinstance(validator, ComeetValidator):
+            return
+        with validator_context(type(validator).__name__), timeline_context(validator.timeline):
+            validator.try_http_fast_path()
 
     def validate_job(self, job: JobPost, validator=None) -> bool:
+        with validator_context(type(validator).__name__ if validator else "none"), \
+                timeline_context(validator.timeline) if validator else nullcontext():
+            return self._validate_job(job, validator)
+
+    def _validate_job(self, job: JobPost, validator=None) -> bool:
         metadata = {}
         try:
             # validator = ValidatorFactory.create_validator(job.link)
             if not validator:
                 logger.warning(f"⚠️ No validator for: {job.link}")
-                with commit_or_rollback(self.db, job):
+                with self.persist(job):
                     job.validated = True
                     job.status = "no validator error"
                     job.validated_date = datetime.now(self.israel_tz)
                 return False
 
+            attach_source_fingerprint(job, validator)
             if not validator.validate():
                 logger.error(f"❌ Validation failed: {job.link} id: {job.id} reason: {validator.error_reason}")
                 
-                with commit_or_rollback(self.db, job):
+                with self.persist(job):
                     job.validated = True
                     job.status = validator.job_status or "validation failed"
                     job.error_reason = validator.error_reason or "Validation failed"
                     job.validated_date = datetime.now(self.israel_tz)
                 return False
 
+            if getattr(validator, "unchanged", False):
+                return self.refresh_unchanged_job(job, validator)
+
             try:
                 metadata = validator.extract_metadata()
                 logger.debug(f"📦 Metadata: {metadata}")
@@ -133,20 +518,16 @@ class JobValidatorService:
                     "description", "posted_time", "requirements", "link", "responsibilities"
                 ], validator)
 
-                self.results.append({
-                    "link": job.link,
-                    "status": "validated",
-                    "metadata": metadata
-                })
                 #TODO move to validated function
-                with commit_or_rollback(self.db, job):
+                with self.persist(job):
                     job.validated = True
                     job.status = "valid"
                     job.validated_date = datetime.now(self.israel_tz)
+                    store_source_fingerprint(job, validator)
                 return True
             except LocationValidationError as e:
                 logger.warning(f"⚠️ Validation error for job {job.link}: {e}")    
-                with commit_or_rollback(self.db, job):
+                with self.persist(job):
                     job.validated = True
                     job.status = "validation failed"
                     job.error_reason = str(e) or "job location is not in Israel"
@@ -159,6 +540,21 @@ class JobValidatorService:
 
             return False
 
+    def refresh_unchanged_job(self, job: JobPost, validator) -> bool:
+        """
+        The source posting is the same as at the job's last successful validation (304 or same content hash):
+        skip metadata extraction (HTML cleaning, geo checks, GPT) and only refresh validated_date.
+        """
+        logger.info(f"♻️ Unchanged since last validation, refreshing validated_date only: {job.link} id: {job.id}")
+        with self.persist(job):
+            job.validated = True
+            job.status = "valid"
+            job.fields_updated = []
+            job.last_validated_by = type(validator).__name__
+            job.validated_date = datetime.now(self.israel_tz)
+            store_source_fingerprint(job, validator)
+        return True
+
     def run_batch(self, jobs: list[JobPost]):
         for job in jobs:
             self.validate_job(job)
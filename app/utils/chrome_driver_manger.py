@@ -1,8 +1,19 @@
+from contextlib import ExitStack
+from typing import Optional
+
 from app.log_config import logger
+from app.utils.chrome_driver_pool import ChromeDriverPool, get_driver_pool
 
 class DriverManager:
-    def __init__(self):
+    def __init__(self, driver_pool: Optional[ChromeDriverPool] = None):
+        """
+        Args:
+            driver_pool: Lease drivers from this pool instead of launching new ones
+                         (default: the app-wide pool, if the app started one).
+        """
         self.pool = {}
+        self.driver_pool = driver_pool or get_driver_pool()
+        self._leases = ExitStack()
 
     def get_or_create(self, validator):
         validator_type = type(validator).__name__.lower()
@@ -10,18 +21,41 @@ class DriverManager:
         if not validator.uses_driver():
             raise Exception(f"{validator_type} does not use a driver, but get_or_create was called.")
         
-        if validator_type not in self.pool:
-            if hasattr(validator, "_init_driver"):
-                self.pool[validator_type] = validator._init_driver()
-                logger.info(f"🚗 Created shared driver for {validator_type}")
-            else:
-                raise Exception(f"{validator_type} does not support driver injection.")
+        if validator_type in self.pool:
+            return self.refresh(validator)  # Called once per job, a good point to recycle
+        if self.driver_pool:
+            self.pool[validator_type] = self._leases.enter_context(self.driver_pool.lease())
+            logger.info(f"🚗 Leased pooled driver for {validator_type}")
+        elif hasattr(validator, "_init_driver"):
+            self.pool[validator_type] = validator._init_driver()
+            logger.info(f"🚗 Created shared driver for {validator_type}")
+        else:
+            raise Exception(f"{validator_type} does not support driver injection.")
+        return self.pool[validator_type]
+
+    def needs_refresh(self, validator) -> bool:
+        """The pooled driver shared by this validator type is due for recycling."""
+        driver = self.pool.get(type(validator).__name__.lower())
+        return bool(self.driver_pool and driver is not None and self.driver_pool.needs_recycle(driver))
+
+    def refresh(self, validator):
+        """
+        The shared driver for this validator type, replaced by a fresh one if the pool says it's due
+        (page count or memory). Call between jobs: a run holds its lease for all its pages.
+        """
+        validator_type = type(validator).__name__.lower()
+        if self.needs_refresh(validator):
+            self.pool[validator_type] = self.driver_pool.replace(self.pool[validator_type])
         return self.pool[validator_type]
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.driver_pool:
+            logger.info("🔙 Returning leased WebDrivers to the pool...")
+            self._leases.close()
+            return
         logger.info("🧹 Shutting down all shared WebDrivers...")
         for key, driver in self.pool.items():
             try:
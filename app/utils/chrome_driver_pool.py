@@ -0,0 +1,285 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from app.log_config import logger
+
+
+class _PooledDriver:
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self.pages = 0  # Job pages rendered, counted by the validators (see record_rendered_pages)
+        self.created_at = time.time()
+
+
+def _process_tree_rss_mb(root_pid: int) -> Optional[float]:
+    """
+    Total RSS (MB) of a process and all its descendants (chromedriver → chrome → renderers).
+    Reads /proc, returns None where that isn't available.
+    """
+    try:
+        children: Dict[int, List[int]] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # pid (comm) state ppid ... — comm may contain spaces, so split after the last ")"
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        total_bytes = 0
+        stack = [root_pid]
+        while stack:
+            pid = stack.pop()
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total_bytes += int(f.read().split()[1]) * page_size
+            except (OSError, IndexError, ValueError):
+                pass
+            stack.extend(children.get(pid, []))
+        return total_bytes / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class ChromeDriverPool:
+    """
+    App-lifetime pool of warm Chrome drivers.
+    Drivers are leased to validators and health-checked before each lease.
+    A driver is recycled after max_pages rendered pages or when the browser process tree grows
+    over max_rss_mb: when it is returned, or between jobs of a long lease (needs_recycle / replace).
+    """
+
+    def __init__(
+        self,
+        driver_factory: Callable[[], WebDriver],
+        size: int,
+        max_pages_per_driver: int,
+        max_rss_mb: float,
+        lease_timeout: float,
+    ):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_rss_mb = max_rss_mb
+        self.lease_timeout = lease_timeout
+        self._idle: "queue.Queue[_PooledDriver]" = queue.Queue()
+        self._leases: Dict[int, _PooledDriver] = {}  # id(driver) → leased driver
+        self._live = 0
+        self._leased = 0
+        self._recycled = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        """Start the drivers up front so the first requests don't pay the browser launch."""
+        for _ in range(self.size):
+            with self._lock:
+                if self._live >= self.size:
+                    break
+                self._live += 1
+            try:
+                self._idle.put(self._create())
+            except Exception as e:
+                with self._lock:
+                    self._live -= 1
+                logger.error(f"🚫 Could not start pooled Chrome driver: {e}")
+                break
+        logger.info(f"🚗 Chrome driver pool started with {self._live}/{self.size} drivers")
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """Lease a driver for the duration of the with-block."""
+        pooled = self._acquire(timeout if timeout is not None else self.lease_timeout)
+        try:
+            yield pooled.driver
+        finally:
+            self._release(pooled)
+
+    def count_pages(self, driver: WebDriver, pages: int = 1) -> None:
+        """Count pages rendered by a leased driver (unknown drivers are ignored)."""
+        with self._lock:
+            pooled = self._leases.get(id(driver))
+            if pooled:
+                pooled.pages += pages
+
+    def needs_recycle(self, driver: WebDriver) -> bool:
+        """The leased driver rendered max_pages pages or grew over max_rss_mb."""
+        with self._lock:
+            pooled = self._leases.get(id(driver))
+        return bool(pooled and self._recycle_reason(pooled))
+
+    def replace(self, driver: WebDriver) -> WebDriver:
+        """
+        Recycle a leased driver without ending the lease: quit it and return a fresh one
+        (the lease now holds the new driver). Call between jobs, with no page in progress.
+        """
+        with self._lock:
+            pooled = self._leases.pop(id(driver), None)
+        if pooled is None:
+            return driver
+        logger.info(f"♻️ Recycling leased Chrome driver: {self._recycle_reason(pooled)}")
+        self._recycled += 1
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to quit pooled Chrome driver: {e}")
+        try:
+            pooled.driver = self.driver_factory()
+        finally:
+            # On failure the lease keeps the quit driver, _release() replaces it
+            pooled.pages = 0
+            pooled.created_at = time.time()
+            with self._lock:
+                self._leases[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def shutdown(self) -> None:
+        """Quit all idle drivers. Leased drivers are quit when they are returned."""
+        self._closed = True
+        logger.info("🧹 Shutting down Chrome driver pool...")
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "live": self._live,
+            "idle": self._idle.qsize(),
+            "leased": self._leased,
+            "recycled": self._recycled,
+        }
+
+    def _create(self) -> _PooledDriver:
+        driver = self.driver_factory()
+        logger.info("🚗 Created pooled Chrome driver")
+        return _PooledDriver(driver)
+
+    def _acquire(self, timeout: float) -> _PooledDriver:
+        if self._closed:
+            raise RuntimeError("Chrome driver pool is shut down")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._live < self.size
+                    if can_create:
+                        self._live += 1
+                if can_create:
+                    try:
+                        pooled = self._create()
+                    except Exception:
+                        with self._lock:
+                            self._live -= 1
+                        raise
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No Chrome driver available after {timeout}s")
+                    try:
+                        pooled = self._idle.get(timeout=min(remaining, 1.0))
+                    except queue.Empty:
+                        continue
+
+            if self._is_healthy(pooled):
+                with self._lock:
+                    self._leased += 1
+                    self._leases[id(pooled.driver)] = pooled
+                return pooled
+            logger.warning("⚠️ Pooled Chrome driver failed health check, replacing it")
+            self._discard(pooled)
+
+    def _release(self, pooled: _PooledDriver) -> None:
+        with self._lock:
+            self._leased -= 1
+            self._leases.pop(id(pooled.driver), None)
+
+        if self._closed:
+            self._discard(pooled)
+            return
+
+        reason = self._recycle_reason(pooled)
+        if reason:
+            logger.info(f"♻️ Recycling Chrome driver: {reason}")
+            self._recycle(pooled)
+            return
+
+        try:
+            self._reset(pooled.driver)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not reset pooled Chrome driver: {e}")
+            self._recycle(pooled)
+            return
+        self._idle.put(pooled)
+
+    def _recycle_reason(self, pooled: _PooledDriver) -> Optional[str]:
+        if pooled.pages >= self.max_pages_per_driver:
+            return f"{pooled.pages} pages rendered"
+        try:
+            rss_mb = _process_tree_rss_mb(pooled.driver.service.process.pid) if self.max_rss_mb else None
+        except Exception:
+            rss_mb = None  # Driver process already gone, the health check catches it
+        if rss_mb is not None and rss_mb > self.max_rss_mb:
+            return f"using {rss_mb:.0f} MB RSS"
+        return None
+
+    def _reset(self, driver: WebDriver) -> None:
+        """Close extra tabs and leave the last one on a blank page, so the next lease starts clean."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+
+    def _is_healthy(self, pooled: _PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _recycle(self, pooled: _PooledDriver) -> None:
+        self._recycled += 1
+        self._discard(pooled)  # A new driver is created lazily by the next lease
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        with self._lock:
+            self._live -= 1
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to quit pooled Chrome driver: {e}")
+
+
+_driver_pool: Optional[ChromeDriverPool] = None
+
+
+def set_driver_pool(pool: Optional[ChromeDriverPool]) -> None:
+    global _driver_pool
+    _driver_pool = pool
+
+
+def get_driver_pool() -> Optional[ChromeDriverPool]:
+    """The app-wide pool (set by the FastAPI lifespan), or None outside the app."""
+    return _driver_pool
+
+
+def record_rendered_pages(driver: WebDriver, pages: int = 1) -> None:
+    """Count pages a validator loaded in driver against its pool recycling limit (no-op outside the pool)."""
+    if _driver_pool is not None:
+        _driver_pool.count_pages(driver, pages)
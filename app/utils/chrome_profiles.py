@@ -0,0 +1,98 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from app.config import settings
+from app.log_config import logger
+
+
+# Resources we never read when extracting job data: images, fonts, media, analytics, trackers, embeds
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*connect.facebook.net*",
+    "*hotjar.com*", "*fullstory.com*", "*clarity.ms*", "*mouseflow.com*",
+    "*segment.io*", "*segment.com*", "*mixpanel.com*", "*amplitude.com*", "*heap.io*",
+    "*intercom.io*", "*intercomcdn.com*", "*zdassets.com*", "*drift.com*",
+    "*hubspot.com*", "*hs-scripts.com*", "*hs-analytics.net*",
+    "*linkedin.com/px*", "*snap.licdn.com*", "*ads-twitter.com*", "*analytics.tiktok.com*", "*bat.bing.com*",
+    "*nr-data.net*", "*newrelic.com*", "*sentry.io*",
+    "*youtube.com/embed*", "*player.vimeo.com*", "*wistia.com*",
+]
+
+BASE_ARGUMENTS = [
+    "--headless",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1920,1080",
+    "--ignore-certificate-errors",
+]
+
+EXTRACTION_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--no-first-run",
+    # Keep background tabs running at full speed (ComeetTabRenderer loads several at once)
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+
+def build_chrome_options(profile: str = "default") -> Options:
+    """
+    Chrome options for a named profile:
+    - "default": plain headless Chrome.
+    - "extraction": no images / extensions / background networking, eager page load strategy.
+    """
+    options = Options()
+    for argument in BASE_ARGUMENTS:
+        options.add_argument(argument)
+
+    if profile == "extraction":
+        for argument in EXTRACTION_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+        })
+        # Return once the DOM is ready, validators wait for the elements they need themselves
+        options.page_load_strategy = "eager"
+    elif profile != "default":
+        logger.warning(f"⚠️ Unknown Chrome profile '{profile}', using default")
+    return options
+
+
+def block_resources_in_current_tab(driver: WebDriver) -> None:
+    """
+    Block BLOCKED_URL_PATTERNS in the current tab (DevTools rules are per tab,
+    call again after opening a new one). No-op for drivers not using the extraction profile.
+    """
+    if getattr(driver, "chrome_profile", None) != "extraction":
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        logger.warning(f"⚠️ Could not set blocked URLs: {e}")
+
+
+def create_chrome_driver(profile: str = None) -> WebDriver:
+    """Start a Chrome driver with the given profile (default: settings.CHROME_PROFILE) and explicit timeouts."""
+    profile = profile or settings.CHROME_PROFILE
+    driver = webdriver.Chrome(options=build_chrome_options(profile))
+    driver.chrome_profile = profile
+    driver.set_page_load_timeout(settings.CHROME_PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(settings.CHROME_SCRIPT_TIMEOUT)
+    block_resources_in_current_tab(driver)
+    return driver
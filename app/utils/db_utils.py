@@ -1,11 +1,18 @@
 import pytz 
+import time
 from contextlib import contextmanager
+from typing import Any, Dict, Tuple
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import inspect, text, update
+from app.db.session import engine
 from app.models.job_post import JobPost
 from app.log_config import logger
+from app.utils.metrics import stage_timer
 from datetime import datetime
 
 ISRAEL_TZ = pytz.timezone("Israel")
+ALTER_LOCK_TIMEOUT = "5s"  # ensure_columns() gives up instead of queueing every job_posts query behind its lock
 
 @contextmanager
 def commit_or_rollback(session: Session, job: JobPost):
@@ -16,9 +23,137 @@ def commit_or_rollback(session: Session, job: JobPost):
     try:
         session.add(job)
         yield
-        session.commit()
+        with stage_timer("commit"):
+            session.commit()
     except Exception as e:
         session.rollback()
         job.status = "commit_error"
         job.validated_date = datetime.now(ISRAEL_TZ)  # ⏰ Set timestamp inside commit context
         logger.exception(f"❌ Commit failed for {job.link}: {e}")
+
+
+def ensure_tables(*tables) -> bool:
+    """
+    Create the given tables if they don't exist yet (e.g. cache tables owned by this service).
+    Returns False if they can't be created (e.g. missing CREATE privilege), callers should then
+    work without them.
+    """
+    try:
+        for table in tables:
+            table.create(bind=engine, checkfirst=True)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Could not create tables {[table.name for table in tables]}: {e}")
+        return False
+
+
+def ensure_columns(table, *columns) -> bool:
+    """
+    Add columns that were added to a model after its table was created (Postgres ADD COLUMN IF NOT EXISTS).
+    ALTER TABLE takes an ACCESS EXCLUSIVE lock even when the column exists, so it only runs for missing
+    columns and with a short lock_timeout. Call it before any session of this process reads the table
+    (at startup), otherwise it waits for that session's own transaction.
+    Args:
+        table: The SQLAlchemy Table (e.g. JobPost.__table__).
+        columns: Column objects of that table.
+    Returns False if they can't be added, callers should then work without them.
+    """
+    try:
+        with engine.begin() as connection:
+            existing = set(connection.execute(
+                text("SELECT column_name FROM information_schema.columns WHERE table_name = :table"),
+                {"table": table.name},
+            ).scalars())
+            missing = [column for column in columns if column.name not in existing]
+            if missing:
+                connection.execute(text(f"SET LOCAL lock_timeout = '{ALTER_LOCK_TIMEOUT}'"))
+            for column in missing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'
+                ))
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Could not add columns {[column.name for column in columns]} to {table.name}: {e}")
+        return False
+
+
+class WriteBehindBuffer:
+    """
+    Collects job updates and writes them as one executemany UPDATE every max_rows jobs
+    or max_delay_ms (checked on add), instead of one commit per change.
+
+    add(job) takes the job's pending attribute changes and marks them as written on the object,
+    so the session itself has nothing to flush. If a batch fails it is retried row by row,
+    a row that still fails gets status "commit_error" like commit_or_rollback does.
+    """
+
+    def __init__(self, session: Session, max_rows: int, max_delay_ms: float):
+        self.session = session
+        self.max_rows = max_rows
+        self.max_delay_ms = max_delay_ms
+        # job id → (job, link, changed values); id and link are kept as plain values because the
+        # rollback of a failed batch expires the instances
+        self._pending: Dict[Any, Tuple[JobPost, str, Dict[str, Any]]] = {}
+        self._first_added_at = None
+        self.flushed_rows = 0
+        self.flushes = 0
+
+    def add(self, job: JobPost) -> None:
+        changes = {}
+        state = inspect(job)
+        for attr in state.attrs:
+            history = attr.history
+            if history.added:
+                changes[attr.key] = history.added[0]
+        if not changes:
+            return
+        for key, value in changes.items():
+            set_committed_value(job, key, value)
+
+        if job.id in self._pending:
+            self._pending[job.id][2].update(changes)
+        else:
+            self._pending[job.id] = (job, job.link, changes)
+        if self._first_added_at is None:
+            self._first_added_at = time.monotonic()
+
+        if len(self._pending) >= self.max_rows or \
+                (time.monotonic() - self._first_added_at) * 1000 >= self.max_delay_ms:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending, self._first_added_at = self._pending, {}, None
+        rows = [{"id": job_id, **changes} for job_id, (_, _, changes) in pending.items()]
+        try:
+            with stage_timer("commit", "write_behind"):
+                self.session.execute(update(JobPost), rows)
+                self.session.commit()
+            self.flushed_rows += len(rows)
+            self.flushes += 1
+            logger.debug(f"💾 Wrote {len(rows)} job updates in one batch")
+        except Exception as e:
+            self.session.rollback()
+            logger.warning(f"⚠️ Batch write of {len(rows)} jobs failed, retrying row by row: {e}")
+            for job_id, (job, link, changes) in pending.items():
+                self._write_row(job_id, link, job, changes)
+
+    def _write_row(self, job_id: Any, link: str, job: JobPost, changes: Dict[str, Any]) -> None:
+        """Write one row by id (never reading the job, which the failed batch's rollback expired)."""
+        try:
+            self.session.execute(update(JobPost).where(JobPost.id == job_id).values(**changes))
+            self.session.commit()
+            self.flushed_rows += 1
+        except Exception as e:
+            self.session.rollback()
+            logger.exception(f"❌ Commit failed for {link}: {e}")
+            error_values = {"status": "commit_error", "validated_date": datetime.now(ISRAEL_TZ)}
+            try:
+                self.session.execute(update(JobPost).where(JobPost.id == job_id).values(**error_values))
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+            for key, value in error_values.items():
+                set_committed_value(job, key, value)
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from html import escape, unescape
+from typing import Iterable, NamedTuple
+
+from bs4 import Comment, NavigableString, Tag
+from bs4.element import Declaration, Doctype, ProcessingInstruction
+
+from app.config import settings
+from app.utils.html_utils import make_soup
+from app.utils.metrics import record_cache, stage_timer
+
+VOID_TAGS = {"br"}
+# Unwrapping one of these leaves a newline in its place (like bleach's strip=True), so the text of
+# neighbouring blocks isn't glued together: <h3>Requirements</h3><div>Python</div> → Requirements\nPython
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "details", "dialog", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr",
+    "li", "main", "nav", "ol", "p", "pre", "section", "table", "ul",
+})
+SKIPPED_NODES = (Comment, Declaration, Doctype, ProcessingInstruction)
+
+
+class CleanedHtml(NamedTuple):
+    html: str  # Sanitized HTML: only allowed tags, no attributes, no comments
+    text: str  # Plain text, same as BeautifulSoup(html).get_text(separator=" ", strip=True)
+
+
+def is_ms_word_span(tag: Tag) -> bool:
+    """Microsoft Word-style <span class="TextRun ..."> / <span class="ccp ..."> wrappers."""
+    return tag.name == "span" and any("TextRun" in cls or "ccp" in cls for cls in tag.get("class") or [])
+
+
+def _clean(html: str, allowed_tags: frozenset) -> CleanedHtml:
+    """
+    One parse and one walk of the tree: MS Word spans and disallowed tags are unwrapped
+    (their text kept, a newline in place of a block tag after the first tag), attributes and comments
+    dropped, and the plain text collected on the way.
+    """
+    soup = make_soup(html)
+    root = soup.body or soup
+    html_parts = []
+    text_parts = []
+    seen_tag = False
+
+    # Iterative walk: (node, closing tag to emit once its children are done)
+    stack = [(child, None) for child in reversed(list(root.children))]
+    while stack:
+        node, closing = stack.pop()
+        if closing is not None:
+            html_parts.append(closing)
+            continue
+        if isinstance(node, SKIPPED_NODES):
+            continue
+        if isinstance(node, NavigableString):
+            html_parts.append(escape(str(node), quote=False))
+            stripped = node.strip()
+            if stripped:
+                text_parts.append(stripped)
+            continue
+
+        keep = node.name in allowed_tags and not is_ms_word_span(node)
+        if not keep and seen_tag and node.name in BLOCK_TAGS:
+            html_parts.append("\n")
+        seen_tag = True
+        if keep:
+            html_parts.append(f"<{node.name}>")
+            if node.name in VOID_TAGS:
+                continue
+            stack.append((None, f"</{node.name}>"))
+        stack.extend((child, None) for child in reversed(list(node.children)))
+
+    return CleanedHtml("".join(html_parts).strip(), " ".join(text_parts))
+
+
+class _CleaningCache:
+    """Small LRU of content hash → CleanedHtml, so unchanged postings skip the parse."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CleanedHtml]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: CleanedHtml) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cache = _CleaningCache(settings.HTML_CLEAN_CACHE_MAX_ENTRIES)
+
+
+def clean_job_html(raw_html: str, allowed_tags: Iterable[str], unescape_first: bool = False) -> CleanedHtml:
+    """
+    Sanitize job HTML and get its plain text in a single pass (memoized by content hash).
+    Args:
+        raw_html (str): The HTML content (HTML-escaped if unescape_first is set, as in the Greenhouse API).
+        allowed_tags: Tags kept in the output, everything else is unwrapped.
+        unescape_first (bool): Decode HTML entities before parsing.
+    Returns:
+        CleanedHtml: (sanitized html, plain text)
+    """
+    if not raw_html:
+        return CleanedHtml("", "")
+    allowed = frozenset(allowed_tags)
+    key = hashlib.sha256(
+        f"{unescape_first}|{','.join(sorted(allowed))}|{raw_html}".encode("utf-8")
+    ).hexdigest()
+    cached = _cache.get(key)
+    record_cache("html_clean", cached is not None)
+    if cached is not None:
+        return cached
+
+    with stage_timer("sanitize"):
+        result = _clean(unescape(raw_html) if unescape_first else raw_html, allowed)
+    _cache.put(key, result)
+    return result
+
+
+def plain_text(html: str) -> str:
+    """Plain text of an HTML fragment (lower-cased, whitespace-joined), for duplicate checks."""
+    return make_soup(html or "").get_text(separator=" ", strip=True).lower()
@@ -0,0 +1,15 @@
+from bs4 import BeautifulSoup
+
+from app.utils.metrics import stage_timer
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:  # Pure-python fallback, same results on well-formed pages, several times slower
+    HTML_PARSER = "html.parser"
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse HTML with the fastest available BeautifulSoup backend (lxml when installed)."""
+    with stage_timer("parse"):
+        return BeautifulSoup(html or "", HTML_PARSER)
@@ -0,0 +1,270 @@
+"""
+Offline gazetteer of Israeli localities and districts.
+
+Lets is_location_in_israel() decide on known locations without calling OpenCage / GPT.
+The index is a hash of normalized name → entry, built once at import. A lookup normalizes
+the location, splits it on commas and probes every token n-gram of each part,
+so "Hybrid - Petach Tikva office, Center District, IL" costs a few dict lookups.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# (canonical name, variants: English transliterations + Hebrew)
+LOCALITIES: List[Tuple[str, List[str]]] = [
+    ("Tel Aviv", ["tel aviv", "tel-aviv", "tel aviv yafo", "tel aviv-yafo", "tel aviv jaffa", "tlv", "telaviv",
+                  "jaffa", "yafo", "ramat aviv", "תל אביב", "תל אביב יפו", "תל-אביב", "ת\"א", "יפו"]),
+    ("Jerusalem", ["jerusalem", "yerushalayim", "ירושלים"]),
+    ("Haifa", ["haifa", "heifa", "hefa", "חיפה"]),
+    ("Herzliya", ["herzliya", "herzliyya", "herzlia", "hertzliya", "hertzelia", "herzelia", "herzliya pituach",
+                  "herzliya pitouach", "הרצליה", "הרצליה פיתוח"]),
+    ("Petah Tikva", ["petah tikva", "petach tikva", "petah tiqva", "petach tikvah", "petah tikvah", "petah-tikva",
+                     "petach-tikva", "ptk", "פתח תקווה", "פתח תקוה"]),
+    ("Rishon LeZion", ["rishon lezion", "rishon le zion", "rishon letzion", "rishon le-zion", "rishon leziyyon",
+                       "ראשון לציון"]),
+    ("Beer Sheva", ["beer sheva", "be'er sheva", "beersheba", "beer-sheva", "beersheva", "be'er sheba", "באר שבע"]),
+    ("Kfar Saba", ["kfar saba", "kfar sava", "kefar sava", "כפר סבא"]),
+    ("Netanya", ["netanya", "natanya", "netania", "נתניה"]),
+    ("Ramat Gan", ["ramat gan", "ramat-gan", "רמת גן"]),
+    ("Givatayim", ["givatayim", "givataim", "גבעתיים"]),
+    ("Bnei Brak", ["bnei brak", "bne brak", "bnei-brak", "בני ברק"]),
+    ("Holon", ["holon", "חולון"]),
+    ("Bat Yam", ["bat yam", "bat-yam", "בת ים"]),
+    ("Ra'anana", ["raanana", "ra'anana", "ra'annana", "רעננה"]),
+    ("Hod HaSharon", ["hod hasharon", "hod ha sharon", "hod ha'sharon", "hod-hasharon", "הוד השרון"]),
+    ("Ramat HaSharon", ["ramat hasharon", "ramat ha sharon", "ramat ha'sharon", "רמת השרון"]),
+    ("Rosh HaAyin", ["rosh haayin", "rosh ha'ayin", "rosh ha ayin", "rosh ha'ain", "ראש העין"]),
+    ("Or Yehuda", ["or yehuda", "or-yehuda", "אור יהודה"]),
+    ("Yehud", ["yehud", "yehud monosson", "yehud-monosson", "יהוד", "יהוד מונוסון"]),
+    ("Airport City", ["airport city", "קריית שדה התעופה"]),
+    ("Rehovot", ["rehovot", "rechovot", "rehovoth", "רחובות"]),
+    ("Ness Ziona", ["ness ziona", "nes ziona", "nes tziona", "ness tziona", "נס ציונה"]),
+    ("Lod", ["lod", "lydda", "לוד"]),
+    ("Ramla", ["ramla", "ramle", "רמלה"]),
+    ("Modi'in", ["modiin", "modi'in", "modiin maccabim reut", "modi'in-maccabim-re'ut", "מודיעין",
+                 "מודיעין מכבים רעות"]),
+    ("Shoham", ["shoham", "שוהם"]),
+    ("Yokneam", ["yokneam", "yoqneam", "yokneam illit", "yokne'am", "yokneam ilit", "יקנעם", "יקנעם עילית"]),
+    ("Caesarea", ["caesarea", "qesarya", "kesaria", "keisarya", "קיסריה"]),
+    ("Hadera", ["hadera", "khadera", "חדרה"]),
+    ("Ashdod", ["ashdod", "אשדוד"]),
+    ("Ashkelon", ["ashkelon", "ashqelon", "אשקלון"]),
+    ("Kiryat Gat", ["kiryat gat", "qiryat gat", "קריית גת"]),
+    ("Kiryat Ono", ["kiryat ono", "qiryat ono", "קריית אונו"]),
+    ("Kiryat Shmona", ["kiryat shmona", "qiryat shemona", "קריית שמונה"]),
+    ("Kiryat Bialik", ["kiryat bialik", "קריית ביאליק"]),
+    ("Kiryat Motzkin", ["kiryat motzkin", "קריית מוצקין"]),
+    ("Kiryat Ata", ["kiryat ata", "qiryat ata", "קריית אתא"]),
+    ("Nesher", ["nesher", "נשר"]),
+    ("Tirat Carmel", ["tirat carmel", "tirat hacarmel", "טירת כרמל"]),
+    ("Migdal HaEmek", ["migdal haemek", "migdal ha'emek", "migdal ha emek", "מגדל העמק"]),
+    ("Afula", ["afula", "עפולה"]),
+    ("Nof HaGalil", ["nof hagalil", "nof ha galil", "nazareth illit", "נוף הגליל"]),
+    ("Karmiel", ["karmiel", "carmiel", "כרמיאל"]),
+    ("Tiberias", ["tiberias", "tverya", "טבריה"]),
+    ("Safed", ["safed", "tzfat", "zefat", "tsfat", "צפת"]),
+    ("Nahariya", ["nahariya", "nahariyya", "נהריה"]),
+    ("Akko", ["akko", "acre", "acco", "עכו"]),
+    ("Rosh Pina", ["rosh pina", "rosh pinna", "ראש פינה"]),
+    ("Eilat", ["eilat", "elat", "אילת"]),
+    ("Dimona", ["dimona", "דימונה"]),
+    ("Sderot", ["sderot", "שדרות"]),
+    ("Netivot", ["netivot", "נתיבות"]),
+    ("Ofakim", ["ofakim", "אופקים"]),
+    ("Omer", ["omer", "עומר"]),
+    ("Yavne", ["yavne", "yavneh", "יבנה"]),
+    ("Gedera", ["gedera", "גדרה"]),
+    ("Kfar Yona", ["kfar yona", "kfar yonah", "כפר יונה"]),
+    ("Even Yehuda", ["even yehuda", "אבן יהודה"]),
+    ("Tzur Yigal", ["tzur yigal", "tsur yigal", "צור יגאל"]),
+    ("Kochav Yair", ["kochav yair", "kokhav yair", "כוכב יאיר"]),
+    ("Zichron Yaakov", ["zichron yaakov", "zikhron ya'akov", "zichron ya'akov", "זכרון יעקב"]),
+    ("Binyamina", ["binyamina", "בנימינה"]),
+    ("Pardes Hanna", ["pardes hanna", "pardes hana", "pardes hanna karkur", "פרדס חנה"]),
+    ("Or Akiva", ["or akiva", "אור עקיבא"]),
+    ("Kfar Qasim", ["kafr qasim", "kfar kasem", "kafr kasim", "כפר קאסם"]),
+    ("Tayibe", ["tayibe", "taibe", "טייבה"]),
+    ("Umm al-Fahm", ["umm al fahm", "umm al-fahm", "אום אל פחם"]),
+    ("Sakhnin", ["sakhnin", "סכנין"]),
+    ("Beit Shemesh", ["beit shemesh", "bet shemesh", "בית שמש"]),
+    ("Mevaseret Zion", ["mevaseret zion", "mevaseret tzion", "מבשרת ציון"]),
+    ("Ma'ale Adumim", ["maale adumim", "ma'ale adumim", "מעלה אדומים"]),
+    ("Beit Shean", ["beit shean", "beit she'an", "בית שאן"]),
+    ("Rahat", ["rahat", "רהט"]),
+    ("Arad", ["arad", "ערד"]),
+    ("Mitzpe Ramon", ["mitzpe ramon", "מצפה רמון"]),
+    ("Kfar Vradim", ["kfar vradim", "כפר ורדים"]),
+    ("Matam", ["matam", "מת\"ם"]),
+    ("Gush Dan", ["gush dan", "גוש דן"]),
+    ("Savyon", ["savyon", "סביון"]),
+    ("Ganei Tikva", ["ganei tikva", "ganei tikvah", "גני תקווה"]),
+    ("Kadima Zoran", ["kadima zoran", "kadima tzoran", "קדימה צורן"]),
+    ("Mazkeret Batya", ["mazkeret batya", "מזכרת בתיה"]),
+    ("Kiryat Ekron", ["kiryat ekron", "קריית עקרון"]),
+    ("Beit Dagan", ["beit dagan", "בית דגן"]),
+    ("Ariel", ["ariel", "אריאל"]),
+    ("Nazareth", ["nazareth", "natzrat", "נצרת"]),
+    ("Carmel", ["carmel", "כרמל"]),
+]
+
+# Names that are also common place names or words outside Israel: on their own they are left to the geocoder
+AMBIGUOUS_NAMES = {"ariel", "nazareth", "carmel", "omer", "arad", "acre", "elat"}
+
+# (canonical name, variants, ambiguous)
+DISTRICTS: List[Tuple[str, List[str], bool]] = [
+    ("Tel Aviv District", ["tel aviv district", "מחוז תל אביב"], False),
+    ("Haifa District", ["haifa district", "מחוז חיפה"], False),
+    ("Jerusalem District", ["jerusalem district", "מחוז ירושלים"], False),
+    ("Central District", ["hamerkaz", "ha merkaz", "merkaz", "מחוז המרכז"], False),
+    ("Northern District", ["hatsafon", "ha tsafon", "hazafon", "מחוז הצפון"], False),
+    ("Southern District", ["hadarom", "ha darom", "מחוז הדרום"], False),
+    ("Judea and Samaria", ["judea and samaria", "yehuda and shomron", "יהודה ושומרון"], False),
+    ("Central District", ["central district", "center district", "centre district"], True),
+    ("Northern District", ["northern district", "north district"], True),
+    ("Southern District", ["southern district", "south district"], True),
+]
+
+ISRAEL_NAMES = ["israel", "ישראל"]
+
+FOREIGN_COUNTRIES = [
+    "united states", "usa", "united states of america", "united kingdom", "england", "germany", "france", "india",
+    "canada", "poland", "ukraine", "spain", "netherlands", "the netherlands", "singapore", "australia", "japan",
+    "brazil", "mexico", "ireland", "portugal", "romania", "bulgaria", "serbia", "cyprus", "greece", "italy",
+    "switzerland", "sweden", "denmark", "norway", "finland", "austria", "czech republic", "czechia", "hungary",
+    "argentina", "china", "hong kong", "south korea", "korea", "philippines", "vietnam", "united arab emirates",
+    "uae", "turkey", "belgium", "estonia", "lithuania", "latvia", "new zealand", "south africa", "colombia", "chile",
+    "emea", "apac", "latam", "north america", "europe",
+]
+
+# ISO codes only count as the last comma part ("Berlin, DE"), they are too short to match anywhere
+FOREIGN_COUNTRY_CODES = [
+    "us", "gb", "uk", "de", "fr", "in", "ca", "pl", "ua", "es", "nl", "sg", "au", "jp", "br", "mx", "ie", "pt",
+    "ro", "bg", "rs", "cy", "gr", "it", "ch", "se", "dk", "no", "fi", "at", "cz", "hu", "ar", "cn", "hk", "kr",
+    "ph", "vn", "ae", "tr", "be", "ee", "lt", "lv", "nz", "za", "co", "cl",
+]
+
+# US states qualify a place the same way a foreign country does ("Carmel, Indiana", "Jerusalem, Ohio")
+US_STATES = [
+    "alabama", "alaska", "arizona", "arkansas", "california", "colorado", "connecticut", "delaware", "florida",
+    "georgia", "hawaii", "idaho", "illinois", "indiana", "iowa", "kansas", "kentucky", "louisiana", "maine",
+    "maryland", "massachusetts", "michigan", "minnesota", "mississippi", "missouri", "montana", "nebraska",
+    "nevada", "new hampshire", "new jersey", "new mexico", "new york", "north carolina", "north dakota", "ohio",
+    "oklahoma", "oregon", "pennsylvania", "rhode island", "south carolina", "south dakota", "tennessee", "texas",
+    "utah", "vermont", "virginia", "washington", "west virginia", "wisconsin", "wyoming", "district of columbia",
+]
+
+# Two-letter state codes, last comma part only like FOREIGN_COUNTRY_CODES ("Nazareth, PA").
+# "il" is left out: as the last part it means Israel, not Illinois.
+US_STATE_CODES = [
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "fl", "ga", "hi", "id", "in", "ia", "ks", "ky", "la", "me",
+    "md", "ma", "mi", "mn", "ms", "mo", "mt", "ne", "nv", "nh", "nj", "nm", "ny", "nc", "nd", "oh", "ok", "or",
+    "pa", "ri", "sc", "sd", "tn", "tx", "ut", "vt", "va", "wa", "wv", "wi", "wy", "dc",
+]
+
+_KIND_LOCALITY = "locality"
+_KIND_DISTRICT = "district"
+_KIND_ISRAEL = "israel"
+_KIND_FOREIGN = "foreign"
+
+
+def normalize_place_name(text: str) -> str:
+    """
+    Lowercase, drop apostrophes / Hebrew geresh, turn other punctuation into spaces.
+    Example: "Be'er-Sheva" → "beer sheva"
+    """
+    text = re.sub(r"[\'’`\"״׳]", "", text.lower())
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def _build_index() -> Tuple[Dict[str, Tuple[str, str, bool]], int]:
+    """Build the hash index: normalized name → (kind, canonical name, ambiguous)."""
+    index: Dict[str, Tuple[str, str, bool]] = {}
+    for name in FOREIGN_COUNTRIES + US_STATES:
+        index[normalize_place_name(name)] = (_KIND_FOREIGN, name, False)
+    for name, variants, ambiguous in DISTRICTS:
+        for variant in variants:
+            index[normalize_place_name(variant)] = (_KIND_DISTRICT, name, ambiguous)
+    for name, variants in LOCALITIES:
+        for variant in [name] + variants:
+            key = normalize_place_name(variant)
+            index[key] = (_KIND_LOCALITY, name, key in AMBIGUOUS_NAMES)
+    for name in ISRAEL_NAMES:
+        index[normalize_place_name(name)] = (_KIND_ISRAEL, "Israel", False)
+    max_tokens = max(len(key.split()) for key in index)
+    return index, max_tokens
+
+
+_INDEX, _MAX_TOKENS = _build_index()
+_FOREIGN_CODES = frozenset(FOREIGN_COUNTRY_CODES + US_STATE_CODES)
+
+
+def _scan(location: str) -> List[Tuple[str, str, bool]]:
+    """
+    Find all gazetteer entries in the location, longest names first.
+    Returns a list of (kind, canonical name, ambiguous).
+    """
+    matches = []
+    parts = [normalize_place_name(part) for part in location.split(",")]
+    parts = [part for part in parts if part]
+    for position, part in enumerate(parts):
+        is_last = position == len(parts) - 1
+        if is_last and len(parts) > 1:
+            if part == "il":
+                matches.append((_KIND_ISRAEL, "Israel", False))
+                continue
+            if part in _FOREIGN_CODES:
+                matches.append((_KIND_FOREIGN, part, False))
+                continue
+
+        tokens = part.split()
+        used = [False] * len(tokens)
+        for size in range(min(_MAX_TOKENS, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                if any(used[start:start + size]):
+                    continue
+                entry = _INDEX.get(" ".join(tokens[start:start + size]))
+                if entry:
+                    matches.append(entry)
+                    used[start:start + size] = [True] * size
+    return matches
+
+
+def classify_location(location: Optional[str]) -> Optional[bool]:
+    """
+    Decide from the gazetteer only whether a location is in Israel.
+    Returns:
+        True: an unambiguous Israeli locality / district / the country itself, and nothing foreign.
+        False: only foreign countries / US states are mentioned.
+        None: unknown, ask the geocoder. Also when the only Israeli names are ambiguous ("Arad"),
+              or when they sit next to a foreign country / US state ("Jerusalem, Ohio").
+    """
+    if not location:
+        return None
+    matches = _scan(location)
+    if not matches:
+        return None
+    has_foreign = any(kind == _KIND_FOREIGN for kind, _, _ in matches)
+    has_israeli = any(kind != _KIND_FOREIGN for kind, _, _ in matches)
+    if has_foreign:
+        return None if has_israeli else False
+    if any(not ambiguous for _, _, ambiguous in matches):
+        return True
+    return None
+
+
+def find_locality(location: Optional[str]) -> Optional[str]:
+    """
+    Canonical Israeli locality mentioned in the location, e.g. "Petach Tikva, Center District" → "Petah Tikva".
+    Returns "Israel" if only the country is mentioned, None if nothing is found.
+    """
+    if not location:
+        return None
+    matches = _scan(location)
+    if any(kind == _KIND_FOREIGN for kind, _, _ in matches):
+        return None  # "Jerusalem, Ohio" is not the Israeli Jerusalem
+    for kind, name, _ in matches:
+        if kind == _KIND_LOCALITY:
+            return name
+    if any(kind in (_KIND_ISRAEL, _KIND_DISTRICT) for kind, _, _ in matches):
+        return "Israel"
+    return None
@@ -0,0 +1,79 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+
+class JobTimeline:
+    """
+    Compact cost breakdown of one job's validation: ms per stage, HTTP calls and bytes fetched,
+    GPT calls and tokens. Filled through current_timeline by stage_timer() / record_* helpers,
+    one thread or task at a time, so no locking.
+    """
+
+    __slots__ = (
+        "active_seconds", "active_since", "stage_seconds", "http_calls", "bytes_fetched", "gpt_calls", "gpt_tokens",
+    )
+
+    def __init__(self):
+        self.active_seconds = 0.0  # Time spent inside timeline_context() blocks (prefetch + validate_job)
+        self.active_since: Optional[float] = None  # perf_counter() at entering the current block
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.http_calls = 0
+        self.bytes_fetched = 0
+        self.gpt_calls = 0
+        self.gpt_tokens = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready summary, stored in job_posts.validation_timeline (stages can nest, e.g. parse in sanitize)."""
+        active_seconds = self.active_seconds
+        if self.active_since is not None:
+            active_seconds += time.perf_counter() - self.active_since
+        return {
+            "total_ms": round(active_seconds * 1000, 1),
+            "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in self.stage_seconds.items()},
+            "http_calls": self.http_calls,
+            "bytes_fetched": self.bytes_fetched,
+            "gpt_calls": self.gpt_calls,
+            "gpt_tokens": self.gpt_tokens,
+        }
+
+
+current_timeline: ContextVar[Optional[JobTimeline]] = ContextVar("current_timeline", default=None)
+
+
+@contextmanager
+def timeline_context(timeline: JobTimeline):
+    """Attribute the work done in the with-block (and its duration) to timeline."""
+    token = current_timeline.set(timeline)
+    outermost = timeline.active_since is None
+    if outermost:
+        timeline.active_since = time.perf_counter()
+    try:
+        yield timeline
+    finally:
+        if outermost:
+            timeline.active_seconds += time.perf_counter() - timeline.active_since
+            timeline.active_since = None
+        current_timeline.reset(token)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    timeline = current_timeline.get()
+    if timeline is not None:
+        timeline.stage_seconds[stage] += seconds
+
+
+def record_http_call(bytes_fetched: int) -> None:
+    timeline = current_timeline.get()
+    if timeline is not None:
+        timeline.http_calls += 1
+        timeline.bytes_fetched += bytes_fetched or 0
+
+
+def record_gpt_call(tokens: int) -> None:
+    timeline = current_timeline.get()
+    if timeline is not None:
+        timeline.gpt_calls += 1
+        timeline.gpt_tokens += tokens or 0
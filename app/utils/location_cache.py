@@ -0,0 +1,206 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.log_config import logger
+from app.models.location_verdict import LocationVerdict
+from app.utils.db_utils import ensure_tables
+from app.utils.metrics import record_cache
+
+
+def normalize_location_key(location: str) -> str:
+    """
+    Normalize a location string into a cache key.
+    Example: "Tel Aviv-Yafo,  Tel Aviv District, IL" → "tel aviv yafo, tel aviv district, il"
+    """
+    parts = []
+    for part in location.lower().split(","):
+        part = " ".join(re.sub(r"[^\w\s]", " ", part).split())
+        if part:
+            parts.append(part)
+    return ", ".join(parts)
+
+
+class _PendingLookup:
+    """A lookup in progress, shared by all threads asking for the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.verdict: Optional[bool] = None
+
+
+class LocationVerdictCache:
+    """
+    Two-tier cache of location → "is in Israel" verdicts.
+    1. In-process LRU with TTL.
+    2. Postgres table location_verdicts (shared by all replicas, survives restarts).
+    Concurrent lookups of the same key share one remote request.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, use_db: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_db = use_db
+        self._entries: "OrderedDict[str, Tuple[bool, str, float]]" = OrderedDict()  # key → (verdict, source, expires_at)
+        self._pending: Dict[str, _PendingLookup] = {}
+        self._lock = threading.Lock()
+        self._db_ready: Optional[bool] = None
+
+    def get_or_compute(self, location: str, compute: Callable[[str], Tuple[Optional[bool], Optional[str]]]) -> bool:
+        """
+        Return the cached verdict for the location, or compute it once and cache it.
+        Args:
+            location (str): The (cleaned) location string.
+            compute: Called with the location on a miss, returns (verdict, source).
+                     A None verdict means the lookup failed and is not cached.
+        Returns:
+            bool: True if the location is in Israel.
+        """
+        key = normalize_location_key(location)
+        if not key:
+            verdict, _ = compute(location)
+            return bool(verdict)
+
+        with self._lock:
+            cached = self._get_local(key)
+            if cached is not None:
+                record_cache("location", hit=True)
+                return cached
+            pending = self._pending.get(key)
+            is_leader = pending is None
+            if is_leader:
+                pending = self._pending[key] = _PendingLookup()
+
+        if not is_leader:
+            pending.done.wait(timeout=30)
+            if pending.verdict is not None:
+                return pending.verdict
+            verdict, _ = compute(location)  # Shared lookup failed, try on our own
+            return bool(verdict)
+
+        verdict = None
+        try:
+            verdict, source = self._load_from_db(key)
+            record_cache("location", hit=verdict is not None)
+            if verdict is None:
+                verdict, source = compute(location)
+                if verdict is not None:
+                    self._store_in_db(key, verdict, source)
+            if verdict is not None:
+                with self._lock:
+                    self._set_local(key, verdict, source)
+            return bool(verdict)
+        finally:
+            pending.verdict = verdict
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.done.set()
+
+    def seed(self, locations: Iterable[str], verdict: bool, source: str) -> int:
+        """
+        Seed both tiers with known verdicts (existing rows are kept).
+        Returns the number of distinct keys seeded.
+        """
+        keys = {normalize_location_key(location) for location in locations if location}
+        keys.discard("")
+        if not keys:
+            return 0
+
+        with self._lock:
+            for key in keys:
+                if self._get_local(key) is None:
+                    self._set_local(key, verdict, source)
+
+        if self._db_enabled():
+            expires_at = self._expires_at_utc()
+            session = SessionLocal()
+            try:
+                rows = [
+                    {"normalized_location": key, "in_israel": verdict, "source": source, "expires_at": expires_at}
+                    for key in keys
+                ]
+                session.execute(insert(LocationVerdict).values(rows).on_conflict_do_nothing())
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"⚠️ Failed to seed location_verdicts: {e}")
+            finally:
+                session.close()
+        return len(keys)
+
+    def _get_local(self, key: str) -> Optional[bool]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        verdict, _, expires_at = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return verdict
+
+    def _set_local(self, key: str, verdict: bool, source: str) -> None:
+        self._entries[key] = (verdict, source, time.time() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _expires_at_utc(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+
+    def _db_enabled(self) -> bool:
+        if not self.use_db:
+            return False
+        if self._db_ready is None:
+            self._db_ready = ensure_tables(LocationVerdict.__table__)
+            if not self._db_ready:
+                logger.warning("⚠️ location_verdicts table unavailable, using in-process location cache only")
+        return self._db_ready
+
+    def _load_from_db(self, key: str) -> Tuple[Optional[bool], Optional[str]]:
+        if not self._db_enabled():
+            return None, None
+        session = SessionLocal()
+        try:
+            row = session.get(LocationVerdict, key)
+            if row is None or (row.expires_at and row.expires_at < datetime.utcnow()):
+                return None, None
+            return row.in_israel, row.source
+        except Exception as e:
+            logger.warning(f"⚠️ location_verdicts lookup failed for '{key}': {e}")
+            return None, None
+        finally:
+            session.close()
+
+    def _store_in_db(self, key: str, verdict: bool, source: str) -> None:
+        if not self._db_enabled():
+            return
+        session = SessionLocal()
+        try:
+            session.merge(LocationVerdict(
+                normalized_location=key,
+                in_israel=verdict,
+                source=source,
+                created_at=datetime.utcnow(),
+                expires_at=self._expires_at_utc(),
+            ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"⚠️ Failed to store location verdict for '{key}': {e}")
+        finally:
+            session.close()
+
+
+location_cache = LocationVerdictCache(
+    max_entries=settings.LOCATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LOCATION_CACHE_TTL_HOURS * 3600,
+    use_db=settings.LOCATION_CACHE_DB_ENABLED,
+)
@@ -1,10 +1,15 @@
-import requests
-from typing import Optional
+from typing import Optional, Tuple
 import re
+from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.log_config import logger
+from app.models.job_post import JobPost
 from app.services.gpt_fallback import classify_location_with_gpt
+from app.utils.location_cache import location_cache
+from app.utils.israel_gazetteer import classify_location
+from app.utils.rate_limiter import limited_get
+from app.utils.metrics import stage_timer
 
 
 def clean_location(location: str) -> str:
@@ -15,9 +20,13 @@ def clean_location(location: str) -> str:
     location = location.replace('-', ' ')
     return location.strip()
 
+@stage_timer("geo")
 def is_location_in_israel(location: Optional[str]) -> bool:
     """
     Uses OpenCage API to determine if the location is in Israel.
+    Known Israeli localities / districts (and foreign countries) are decided offline by the
+    gazetteer index first, see app/utils/israel_gazetteer.py.
+    Verdicts from OpenCage / GPT are cached (in-process + Postgres), see app/utils/location_cache.py
 
     Args:
         location (Optional[str]): Location string (e.g., "Migdal HaEmek", "Berlin")
@@ -39,7 +48,28 @@ def is_location_in_israel(location: Optional[str]) -> bool:
             if 'il' == last_item.lower():
                 logger.info(f"📍 Location '{location}' contains 'il' in the last part")
                 return True
-        
+
+        gazetteer_verdict = classify_location(location)
+        if gazetteer_verdict is not None:
+            logger.debug(f"📍 Gazetteer classified '{location}' → in Israel: {gazetteer_verdict}")
+            return gazetteer_verdict
+
+        return location_cache.get_or_compute(location, classify_location_remote)
+
+    except Exception as e:
+        logger.error(f"Location check error: {e}")
+        return False
+
+
+def classify_location_remote(location: str) -> Tuple[Optional[bool], Optional[str]]:
+    """
+    Ask OpenCage (and GPT if OpenCage can't resolve it) whether the location is in Israel.
+
+    Returns:
+        (verdict, source): source is "opencage" or "gpt".
+        verdict is None if the lookup failed (so it won't be cached).
+    """
+    try:
         url = "https://api.opencagedata.com/geocode/v1/json"
         params = {
             "q": location,
@@ -48,28 +78,45 @@ def is_location_in_israel(location: Optional[str]) -> bool:
             "language": "en"
         }
         
-        response = requests.get(url, params=params, timeout=5)
+        response = limited_get(url, params=params, timeout=5)
         data = response.json()
 
         if response.status_code != 200:
             # OpenCage failed at HTTP level — don't fallback to GPT
             logger.warning(f"🌍 OpenCage failed with HTTP {response.status_code}")
-            return False
+            return None, None
         if not data.get("results"):
             # OpenCage returned OK, but couldn't resolve location → use GPT fallback
             logger.info(f"🌍 OpenCage returned no results for '{location}' fallback to chatgpt")
             gpt_result = classify_location_with_gpt(location)
             if gpt_result:
                 logger.info(f"📍 GPT classified location '{location}' as in Israel.")
-                return True
+            elif gpt_result is None:
+                logger.warning(f"📍 GPT could not classify location '{location}'")
             else:
                 logger.info(f"📍 GPT classified location '{location}' as NOT in Israel")
-                return False
+            return gpt_result, "gpt"
 
         components = data["results"][0]["components"]
         country = components.get("country", "").lower()
-        return "israel" in country
+        return "israel" in country, "opencage"
 
     except Exception as e:
         logger.error(f"OpenCage API error: {e}")
-        return False
+        return None, None
+
+
+def seed_location_cache(db: Session) -> int:
+    """
+    Seed the location cache with the locations of already validated jobs
+    (a valid job passed the Israel location check).
+    Returns the number of distinct locations seeded.
+    """
+    rows = db.query(JobPost.location).filter(
+        JobPost.status == "valid",
+        JobPost.location.isnot(None),
+    ).distinct().all()
+    locations = [clean_location(location) for (location,) in rows]
+    seeded = location_cache.seed(locations, verdict=True, source="job_posts")
+    logger.info(f"📍 Seeded location cache with {seeded} locations from valid jobs")
+    return seeded
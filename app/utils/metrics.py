@@ -0,0 +1,85 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+from app.utils.job_timeline import record_gpt_call, record_stage
+
+# Validator class of the job being validated in this thread / task, the default label of every stage.
+# asyncio.to_thread() copies it, so geo lookups run off the event loop keep their validator.
+current_validator: ContextVar[str] = ContextVar("current_validator", default="none")
+
+STAGES = ("fetch", "render", "parse", "sanitize", "geo", "gpt", "commit")
+
+STAGE_SECONDS = Histogram(
+    "jobintel_stage_seconds",
+    "Time spent in one pipeline stage (stages can nest, e.g. parse inside sanitize)",
+    ["stage", "validator"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+CACHE_EVENTS = Counter("jobintel_cache_events_total", "Cache lookups by result", ["cache", "result"])
+GPT_TOKENS = Counter("jobintel_gpt_tokens_total", "OpenAI tokens used", ["model", "kind"])
+GPT_COST = Counter("jobintel_gpt_cost_usd_total", "Estimated OpenAI cost in USD", ["model"])
+JOB_STATUSES = Counter("jobintel_job_status_total", "Final job statuses written by validations", ["validator", "status"])
+
+# Plain total of record_job_status() calls, read by the profiler. Run executors and the
+# revalidation scheduler record concurrently, so it is only updated under the lock.
+_jobs_completed = 0
+_jobs_completed_lock = threading.Lock()
+
+
+@contextmanager
+def validator_context(validator_name: str):
+    """Label the stages run inside the with-block with validator_name."""
+    token = current_validator.set(validator_name)
+    try:
+        yield
+    finally:
+        current_validator.reset(token)
+
+
+@contextmanager
+def stage_timer(stage: str, validator: Optional[str] = None):
+    """
+    Observe the with-block's duration in jobintel_stage_seconds (also when it raises)
+    and add it to the job timeline, if any.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(stage, validator or current_validator.get()).observe(elapsed)
+        record_stage(stage, elapsed)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_EVENTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_gpt_usage(model: str, prompt_tokens: int, completion_tokens: int, cost_usd: float) -> None:
+    GPT_TOKENS.labels(model, "prompt").inc(prompt_tokens or 0)
+    GPT_TOKENS.labels(model, "completion").inc(completion_tokens or 0)
+    GPT_COST.labels(model).inc(cost_usd)
+    record_gpt_call((prompt_tokens or 0) + (completion_tokens or 0))
+
+
+def record_job_status(status: Optional[str]) -> None:
+    global _jobs_completed
+    JOB_STATUSES.labels(current_validator.get(), status or "pending").inc()
+    with _jobs_completed_lock:
+        _jobs_completed += 1
+
+
+def jobs_completed() -> int:
+    with _jobs_completed_lock:
+        return _jobs_completed
+
+
+def render_metrics() -> bytes:
+    """The default registry in Prometheus text format (CONTENT_TYPE_LATEST)."""
+    return generate_latest()
+
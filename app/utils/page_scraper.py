@@ -1,11 +1,10 @@
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import time
 import re
 import json
 
 from app.utils.chrome_driver_manger import DriverManager
+from app.utils.chrome_profiles import create_chrome_driver
 
 
 class DummyValidator:
@@ -17,12 +16,7 @@ class DummyValidator:
         return True
 
     def _init_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        return webdriver.Chrome(options=chrome_options)
+        return create_chrome_driver()
 
 
 def extract_visible_text_from_url(url: str, max_length: int = 4000) -> str:
@@ -0,0 +1,191 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.log_config import logger
+from app.utils.metrics import jobs_completed
+
+MAX_SNAPSHOTS = 5  # tracemalloc snapshots kept for diffs, oldest dropped first
+
+
+class ProfilerBusyError(RuntimeError):
+    """Another profile is already running (one at a time keeps the overhead bounded)."""
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over all threads: every interval it reads sys._current_frames()
+    and counts each thread's stack. The output is in collapsed-stack format
+    ("thread;outer;...;inner count" per line), as read by flamegraph.pl and speedscope.
+    Nothing runs between profiles, and a profile costs one frame walk per thread per sample.
+    """
+
+    def __init__(self, interval_ms: float, max_seconds: float):
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}  # code object → "function (file.py)", stable for the process
+
+    def profile(self, seconds: Optional[float] = None, validations: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Sample until `seconds` passed or `validations` more jobs completed (whichever is set),
+        never longer than max_seconds. Blocks the calling thread.
+        Returns:
+            dict: collapsed (str), samples, duration_seconds, validations
+        Raises:
+            ProfilerBusyError: A profile is already running.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            return self._sample(seconds, validations)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: Optional[float], validations: Optional[int]) -> Dict[str, Any]:
+        limit = min(seconds or self.max_seconds, self.max_seconds)
+        start_jobs = jobs_completed()
+        started = time.monotonic()
+        stacks = Counter()
+        samples = 0
+        own_ident = threading.get_ident()
+        logger.info(f"🔬 Profiling for {limit}s" + (f" or {validations} validations" if validations else ""))
+
+        while time.monotonic() - started < limit:
+            if validations and jobs_completed() - start_jobs >= validations:
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+            samples += 1
+            time.sleep(self.interval)
+
+        duration = time.monotonic() - started
+        logger.info(f"🔬 Profile done: {samples} samples in {duration:.1f}s")
+        return {
+            "collapsed": "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+            "samples": samples,
+            "duration_seconds": round(duration, 2),
+            "validations": jobs_completed() - start_jobs,
+        }
+
+    def _collapse(self, thread_name: str, frame) -> str:
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)})"
+            parts.append(label)
+            frame = frame.f_back
+        parts.append(thread_name.replace(";", ":"))
+        return ";".join(reversed(parts))  # Spaces are fine, the count is split off at the last one
+
+
+class MemoryProfiler:
+    """
+    tracemalloc on demand: start() begins tracing (it slows allocations down until stop()),
+    snapshot() keeps the last MAX_SNAPSHOTS snapshots and diff() compares two of them.
+    """
+
+    def __init__(self, frames: int, top: int):
+        self.frames = frames
+        self.top = top
+        self._snapshots: "OrderedDict[str, tuple]" = OrderedDict()  # id → (taken_at, snapshot)
+        self._lock = threading.Lock()
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshots = [
+                {"id": snapshot_id, "taken_at": taken_at} for snapshot_id, (taken_at, _) in self._snapshots.items()
+            ]
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "traced_mb": round(current / 2 ** 20, 2),
+            "peak_mb": round(peak / 2 ** 20, 2),
+            "snapshots": snapshots,
+        }
+
+    def start(self) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            logger.info(f"🧠 tracemalloc started ({self.frames} frames)")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing and drop the snapshots."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("🧠 tracemalloc stopped")
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Take a snapshot (starting tracing if needed) and return its top allocation sites."""
+        self.start()
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        snapshot_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._snapshots[snapshot_id] = (datetime.utcnow(), snapshot)
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        stats = snapshot.statistics("lineno")
+        return {
+            "id": snapshot_id,
+            "total_mb": round(sum(stat.size for stat in stats) / 2 ** 20, 2),
+            "top": [self._format_stat(stat) for stat in stats[:self.top]],
+        }
+
+    def diff(self, base_id: str, target_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Allocation growth from snapshot base_id to target_id (a new snapshot if not given).
+        Raises:
+            KeyError: Unknown snapshot id.
+        """
+        with self._lock:
+            base = self._snapshots[base_id][1]
+            target = self._snapshots[target_id][1] if target_id else None
+        if target is None:
+            target_id = self.snapshot()["id"]
+            with self._lock:
+                target = self._snapshots[target_id][1]
+        stats = target.compare_to(base, "lineno")
+        return {
+            "base": base_id,
+            "target": target_id,
+            "size_diff_mb": round(sum(stat.size_diff for stat in stats) / 2 ** 20, 2),
+            "top": [self._format_diff(stat) for stat in stats[:self.top]],
+        }
+
+    @staticmethod
+    def _filtered(snapshot):
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    @staticmethod
+    def _where(stat) -> str:
+        frame = stat.traceback[0]
+        return f"{frame.filename}:{frame.lineno}"
+
+    def _format_stat(self, stat) -> Dict[str, Any]:
+        return {"where": self._where(stat), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+
+    def _format_diff(self, stat) -> Dict[str, Any]:
+        return {
+            "where": self._where(stat),
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+        }
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from app.config import settings
+from app.log_config import logger
+from app.utils.job_timeline import record_http_call
+
+# Host suffix → upstream name in settings.UPSTREAM_LIMITS
+UPSTREAM_HOSTS = {
+    "greenhouse.io": "greenhouse",
+    "comeet.com": "comeet",
+    "comeet.co": "comeet",
+    "opencagedata.com": "opencage",
+    "openai.com": "openai",
+}
+POLL_INTERVAL = 0.05  # seconds between retries while waiting for a concurrency slot
+
+
+class Slot:
+    """A granted request slot. Set status (HTTP status code) so the limiter can adapt."""
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None  # seconds, from a 429 Retry-After header
+        self.started_at = time.monotonic()
+
+
+class UpstreamLimiter:
+    """
+    Rate and concurrency limit for one upstream API, shared by all threads and event loops.
+
+    - Token bucket: at most `rate` requests per second, bursts of up to `burst`.
+    - AIMD concurrency: the in-flight limit grows by ~1 per `limit` successful fast responses
+      (additive increase) and halves on a 429, a timeout/error or a response slower than
+      latency_target (multiplicative decrease), between min_concurrency and max_concurrency.
+    - A 429 also pauses the bucket for Retry-After seconds (or 1 s).
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_concurrency: int,
+                 min_concurrency: int = 1, latency_target: float = 5.0):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min_concurrency)
+        self.latency_target = latency_target
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.stats_counters = {"requests": 0, "throttled": 0, "slow": 0, "errors": 0, "waited_seconds": 0.0}
+
+    def try_acquire(self) -> float:
+        """Take a token and a concurrency slot if both are free. Returns 0 on success, else seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if self._in_flight >= int(self._limit):
+                return POLL_INTERVAL
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+            self._in_flight += 1
+            self.stats_counters["requests"] += 1
+            return 0.0
+
+    def release(self, slot: Slot, failed: bool = False) -> None:
+        latency = time.monotonic() - slot.started_at
+        with self._lock:
+            self._in_flight -= 1
+            if slot.status == 429:
+                self.stats_counters["throttled"] += 1
+                self._paused_until = time.monotonic() + (slot.retry_after or 1.0)
+                self._decrease()
+                logger.warning(f"🚦 {self.name}: 429, concurrency limit → {int(self._limit)}")
+            elif failed:
+                self.stats_counters["errors"] += 1
+                self._decrease()
+            elif latency > self.latency_target:
+                self.stats_counters["slow"] += 1
+                self._decrease()
+            else:
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+
+    def _decrease(self) -> None:
+        self._limit = max(self.min_concurrency, self._limit / 2)
+
+    @contextmanager
+    def slot(self):
+        """Blocking: wait for a slot, yield it, feed the outcome back on exit."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                break
+            time.sleep(wait)
+            waited += wait
+        self._add_wait(waited)
+        slot = Slot()
+        try:
+            yield slot
+        except Exception:
+            self.release(slot, failed=True)
+            raise
+        self.release(slot)
+
+    @asynccontextmanager
+    async def slot_async(self):
+        """Same as slot() for coroutines, waits with asyncio.sleep."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self._add_wait(waited)
+        slot = Slot()
+        try:
+            yield slot
+        except Exception:
+            self.release(slot, failed=True)
+            raise
+        self.release(slot)
+
+    def _add_wait(self, waited: float) -> None:
+        if waited:
+            with self._lock:
+                self.stats_counters["waited_seconds"] += waited
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.stats_counters.items()},
+            }
+
+
+_limiters: Dict[str, UpstreamLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(upstream: str) -> Optional[UpstreamLimiter]:
+    """The shared limiter of an upstream configured in settings.UPSTREAM_LIMITS, None if not limited."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(upstream)
+        if limiter is None:
+            config = settings.UPSTREAM_LIMITS.get(upstream)
+            if not config:
+                return None
+            limiter = _limiters[upstream] = UpstreamLimiter(upstream, **config)
+        return limiter
+
+
+def upstream_for_url(url: str) -> Optional[str]:
+    host = urlparse(url).netloc.lower()
+    for suffix, upstream in UPSTREAM_HOSTS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return upstream
+    return None
+
+
+@contextmanager
+def upstream_slot(upstream: Optional[str]):
+    """limiter.slot() of the upstream, or a no-op slot when it isn't limited."""
+    limiter = get_limiter(upstream) if upstream else None
+    if limiter is None:
+        yield Slot()
+        return
+    with limiter.slot() as slot:
+        yield slot
+
+
+@asynccontextmanager
+async def upstream_slot_async(upstream: Optional[str]):
+    limiter = get_limiter(upstream) if upstream else None
+    if limiter is None:
+        yield Slot()
+        return
+    async with limiter.slot_async() as slot:
+        yield slot
+
+
+def record_response(slot: Slot, status: int, headers=None) -> None:
+    slot.status = status
+    if status == 429 and headers:
+        try:
+            slot.retry_after = float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            pass
+
+
+def limited_request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests.request() through the limiter of the URL's upstream (see UPSTREAM_HOSTS)."""
+    with upstream_slot(upstream_for_url(url)) as slot:
+        response = requests.request(method, url, **kwargs)
+        record_response(slot, response.status_code, response.headers)
+    record_http_call(len(response.content))
+    return response
+
+
+def limited_get(url: str, **kwargs) -> requests.Response:
+    return limited_request("GET", url, **kwargs)
+
+
+def limited_head(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("allow_redirects", False)  # Same default as requests.head()
+    return limited_request("HEAD", url, **kwargs)
+
+
+def limiter_stats() -> dict:
+    with _limiters_lock:
+        return {name: limiter.stats() for name, limiter in _limiters.items()}
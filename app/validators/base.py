@@ -4,6 +4,7 @@ from urllib.parse import urlparse
 from abc import ABC, abstractmethod
 
 from app.utils.location_utils import is_location_in_israel
+from app.utils.job_timeline import JobTimeline
 from app.log_config import logger  
 
 
@@ -17,6 +18,7 @@ class BaseValidator(ABC):
         self.url = url
         self.error_reason: Optional[str] = None
         self.job_status: Optional[str] = None
+        self.timeline = JobTimeline()  # Cost breakdown of this job's validation, see app/utils/job_timeline.py
 
     def uses_driver(self) -> bool:
         """
@@ -0,0 +1,85 @@
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+SECTION_HEADING_TAGS = ("h2", "h3", "strong", "b")
+MAP_MARKER_CLASS = "fa fa-map-marker"
+
+
+class SectionHeading:
+    """A candidate section heading (h2/h3/strong/b) and the blocks that follow it."""
+
+    def __init__(self, tag: Tag):
+        self.tag = tag
+        self.name = tag.name
+        self.text = tag.get_text(strip=True).lower()
+
+    def next_sibling(self, name: str) -> Optional[Tag]:
+        return self.tag.find_next_sibling(name)
+
+    def container_next_sibling(self, name: str) -> Optional[Tag]:
+        """Next sibling of the enclosing <p> when the heading is inline (e.g. <p><strong>..</strong></p><ul>)."""
+        container = self.tag.find_parent("p") or self.tag
+        return container.find_next_sibling(name)
+
+
+class ComeetPageIndex:
+    """
+    Everything the Comeet field getters look up, collected in one walk over the soup:
+    first h1/h2, map-marker locations, location/description blocks and section headings
+    in document order. Sibling lookups are done lazily per heading, they never walk the tree.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self.h1: Optional[Tag] = None
+        self.h2: Optional[Tag] = None
+        self.position_locations: List[str] = []  # map-marker <li> inside ul.positionDetails
+        self.marker_locations: List[str] = []  # map-marker <li> anywhere
+        self.location_div: Optional[Tag] = None
+        self.subheader_span: Optional[Tag] = None
+        self.description_div: Optional[Tag] = None
+        self.headings: List[SectionHeading] = []
+
+        subheader_seen = False
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            name = tag.name
+            classes = tag.get("class") or []
+
+            if name in SECTION_HEADING_TAGS:
+                self.headings.append(SectionHeading(tag))
+            if name == "h1" and self.h1 is None:
+                self.h1 = tag
+            elif name == "h2" and self.h2 is None:
+                self.h2 = tag
+            elif name == "i" and " ".join(classes) == MAP_MARKER_CLASS:
+                self._add_marker(tag)
+            elif name == "div":
+                if "location" in classes and self.location_div is None:
+                    self.location_div = tag
+                elif "description" in classes and self.description_div is None:
+                    self.description_div = tag
+                elif "careerHeroHeader__subheader" in classes and not subheader_seen:
+                    subheader_seen = True
+                    self.subheader_span = tag.find("span")
+
+    def _add_marker(self, icon: Tag) -> None:
+        li = icon.find_parent("li")
+        if li is None:
+            return
+        text = li.get_text(strip=True).replace(icon.get_text(strip=True), "").strip()
+        self.marker_locations.append(text)
+        ul = li.parent
+        if ul is not None and ul.name == "ul" and "positionDetails" in (ul.get("class") or []):
+            self.position_locations.append(text)
+
+    def find_heading(self, keyword: str, tags=SECTION_HEADING_TAGS) -> Optional[SectionHeading]:
+        """First heading of the given tags whose text contains keyword."""
+        for heading in self.headings:
+            if heading.name in tags and keyword in heading.text:
+                return heading
+        return None
+
+    def headings_matching(self, keywords: List[str]) -> List[SectionHeading]:
+        return [heading for heading in self.headings if any(k in heading.text for k in keywords)]
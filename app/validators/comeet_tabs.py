@@ -0,0 +1,123 @@
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from app.log_config import logger
+from app.models.job_post import JobPost
+from app.utils.chrome_driver_pool import record_rendered_pages
+from app.utils.chrome_profiles import block_resources_in_current_tab
+from app.validators.comeet_validator import ComeetValidator, WAIT_TIME_TO_LOAD_PAGE
+
+# Same ready condition as ComeetValidator.validate(): the apply button is in the DOM
+TAB_READY_SCRIPT = "return document.readyState !== 'loading' && document.querySelector('button') !== null;"
+
+
+class _Tab:
+    def __init__(self, handle: str, job: JobPost, validator: ComeetValidator, deadline: float):
+        self.handle = handle
+        self.job = job
+        self.validator = validator
+        self.deadline = deadline
+        self.timed_out = False
+
+
+class ComeetTabRenderer:
+    """
+    Render several Comeet job pages at once as tabs of one Chrome.
+    Each page is opened in its own tab with a non-blocking navigation, then all tabs are
+    polled for their own ready condition and deadline. Jobs are handed back as soon as
+    their tab is ready (or timed out), with the driver switched to that tab.
+    When needs_new_driver() says the browser is due for recycling, no new tab is opened until the
+    open ones are done, then rendering goes on in the driver returned by new_driver().
+    """
+
+    def __init__(self, driver: WebDriver, tabs: int, wait_seconds: float = WAIT_TIME_TO_LOAD_PAGE,
+                 poll_interval: float = 0.2, needs_new_driver: Optional[Callable[[], bool]] = None,
+                 new_driver: Optional[Callable[[], WebDriver]] = None):
+        self.driver = driver
+        self.tabs = max(1, tabs)
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.needs_new_driver = needs_new_driver
+        self.new_driver = new_driver
+
+    def render(self, items: Iterable[Tuple[JobPost, ComeetValidator]]) -> Iterator[Tuple[JobPost, ComeetValidator]]:
+        """
+        Yields (job, validator) in the order their pages finish loading.
+        The driver stays on the job's tab until the caller asks for the next job,
+        so validator.validate() / extract_metadata() can run on it.
+        """
+        items = iter(items)
+        base_handle = self.driver.current_window_handle
+        open_tabs: List[_Tab] = []
+        exhausted = False
+        try:
+            while True:
+                recycling = not exhausted and self._driver_due()
+                while not recycling and len(open_tabs) < self.tabs:
+                    item = next(items, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    open_tabs.append(self._open_tab(*item))
+                if not open_tabs:
+                    if exhausted:
+                        break
+                    # Every tab is done: swap the browser before opening the next ones
+                    self.driver = self.new_driver()
+                    base_handle = self.driver.current_window_handle
+                    continue
+
+                tab = self._wait_for_any(open_tabs)
+                open_tabs.remove(tab)
+                self.driver.switch_to.window(tab.handle)
+                tab.validator.set_driver(self.driver)
+                tab.validator.use_preloaded_page(timed_out=tab.timed_out)
+                try:
+                    yield tab.job, tab.validator
+                finally:
+                    self._close_tab(tab.handle, base_handle)
+        finally:
+            for tab in open_tabs:
+                self._close_tab(tab.handle, base_handle)
+
+    def _driver_due(self) -> bool:
+        return self.needs_new_driver is not None and self.new_driver is not None and self.needs_new_driver()
+
+    def _open_tab(self, job: JobPost, validator: ComeetValidator) -> _Tab:
+        self.driver.switch_to.new_window("tab")
+        handle = self.driver.current_window_handle
+        block_resources_in_current_tab(self.driver)
+        # driver.get() would block until the page loads, a script navigation returns right away
+        self.driver.execute_script("window.location.href = arguments[0];", validator.url)
+        record_rendered_pages(self.driver)
+        logger.debug(f"🗂️ Opened tab for {validator.url}")
+        return _Tab(handle, job, validator, time.monotonic() + self.wait_seconds)
+
+    def _wait_for_any(self, open_tabs: List[_Tab]) -> _Tab:
+        """Poll the open tabs until one is ready or past its deadline."""
+        while True:
+            for tab in open_tabs:
+                try:
+                    self.driver.switch_to.window(tab.handle)
+                    if self.driver.execute_script(TAB_READY_SCRIPT):
+                        return tab
+                except Exception:
+                    pass  # Page is still navigating
+                if time.monotonic() > tab.deadline:
+                    tab.timed_out = True
+                    return tab
+            time.sleep(self.poll_interval)
+
+    def _close_tab(self, handle: str, base_handle: str) -> None:
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to close tab: {e}")
+        finally:
+            try:
+                self.driver.switch_to.window(base_handle)
+            except Exception:
+                pass
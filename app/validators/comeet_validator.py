@@ -1,7 +1,9 @@
 import json
 from datetime import datetime
+from typing import Optional
 from urllib.parse import urlparse
 import re
+import html as html_lib
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
@@ -18,13 +20,73 @@ import re
 import json
 import bleach
 
+from app.config import settings
 from app.validators.base import BaseValidator
+from app.validators.page_snapshot import PageSnapshot
+from app.validators.comeet_page_index import ComeetPageIndex
+from app.utils.html_utils import make_soup
+from app.utils.rate_limiter import limited_get
+from app.utils.metrics import stage_timer
 from app.utils.location_utils import is_location_in_israel
+from app.utils.israel_gazetteer import find_locality
+from app.utils.chrome_driver_pool import record_rendered_pages
+from app.utils.chrome_profiles import create_chrome_driver
 from app.exceptions.exceptions import LocationValidationError
 
 
 WAIT_TIME_TO_LOAD_PAGE = 15  # seconds
 EXPECTED_SELECTOR = "h1, button"
+HTTP_FETCH_TIMEOUT = 10  # seconds
+HTTP_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+RESPONSIBILITY_KEYWORDS = ["responsibilit", "what you'll do", "you will do"]
+REQUIREMENT_KEYWORDS = ["requirement", "qualifications", "experience"]
+
+# Runs inside the page and returns only what the extractors read, instead of the whole
+# page_source. Mirrors the lookups of get_title / get_location / get_description and the
+# section getters (heading → next <ul>/<div> sibling). arguments[0]: section keywords.
+EXTRACTION_SCRIPT = """
+const keywords = arguments[0];
+const text = (el) => el ? el.textContent.trim() : null;
+const nextSibling = (el, tag) => {
+    for (let sib = el.nextElementSibling; sib; sib = sib.nextElementSibling) {
+        if (sib.tagName.toLowerCase() === tag) return sib.outerHTML;
+    }
+    return null;
+};
+const markerText = (li) => {
+    const icon = li.querySelector('i.fa.fa-map-marker');
+    return icon ? li.textContent.replace(icon.textContent, '').trim() : null;
+};
+const sections = [];
+for (const heading of document.querySelectorAll('h2, h3, strong, b')) {
+    const headingText = heading.textContent.trim();
+    if (!keywords.some(k => headingText.toLowerCase().includes(k))) continue;
+    const paragraph = heading.closest('p');
+    sections.push({
+        tag: heading.tagName.toLowerCase(),
+        text: headingText,
+        in_p: paragraph !== null,
+        next_ul: nextSibling(heading, 'ul'),
+        next_div: nextSibling(heading, 'div'),
+        container_next_ul: paragraph ? nextSibling(paragraph, 'ul') : null,
+    });
+}
+const subheaderSpan = document.querySelector('div.careerHeroHeader__subheader span');
+const description = document.querySelector('div.description');
+return {
+    final_url: window.location.href,
+    json_ld: Array.from(document.querySelectorAll('script[type="application/ld+json"]')).map(s => s.textContent),
+    h1: text(document.querySelector('h1')),
+    h2: text(document.querySelector('h2')),
+    position_locations: Array.from(document.querySelectorAll('ul.positionDetails li')).map(markerText).filter(t => t !== null),
+    location: text(document.querySelector('div.location')),
+    marker_locations: Array.from(document.querySelectorAll('li')).map(markerText).filter(t => t !== null),
+    subheader: text(subheaderSpan),
+    description: description ? description.outerHTML : null,
+    sections: sections,
+};
+"""
 
 
 class ComeetValidator(BaseValidator):
@@ -35,10 +97,151 @@ class ComeetValidator(BaseValidator):
         # self.wait = WebDriverWait(self.driver, WAIT_TIME_TO_LOAD_PAGE)
         self.driver = None
         self.wait = None
+        # Set by ComeetTabRenderer when the page was already loaded in its own tab
+        self.page_preloaded = False
+        self.preload_timed_out = False
+        # The job page, fetched once (HTTP fast path or browser) and reused by validate() and extract_metadata()
+        self.snapshot: Optional[PageSnapshot] = None
+        self.http_fast_path_tried = False
+        self._page_index: Optional[ComeetPageIndex] = None
+        self._page_index_soup = None
 
     def uses_driver(self) -> bool:
+        """
+        Comeet needs a browser unless the HTTP fast path already got a usable page
+        (try_http_fast_path, run by the service before attaching a driver).
+        """
+        return not (self.snapshot and self.snapshot.source == "http")
+
+    def try_http_fast_path(self) -> bool:
+        """
+        Fetch the job page with plain HTTP and use the server HTML if it has everything we need:
+        a JSON-LD JobPosting with title, description and location, an apply button, not past its
+        validThrough date, and it's not the company landing page. Tried once per validator.
+        Returns True if the static page is usable (validate/extract_metadata then skip Selenium).
+        """
+        if self.http_fast_path_tried:
+            return bool(self.snapshot and self.snapshot.source == "http")
+        self.http_fast_path_tried = True
+        try:
+            with stage_timer("fetch", "ComeetValidator"):
+                response = limited_get(self.url, headers=HTTP_HEADERS, timeout=HTTP_FETCH_TIMEOUT)
+            if response.status_code != 200:
+                logger.info(f"🐢 HTTP fast path: status {response.status_code} for {self.url}, using browser")
+                return False
+            if self.url_is_company_page(response.url):
+                logger.info(f"🐢 HTTP fast path: redirected to company page {response.url}, using browser")
+                return False
+
+            soup = make_soup(response.text)
+            json_ld = self.extract_json_ld(soup)
+            if not json_ld or json_ld.get("@type") != "JobPosting":
+                logger.info(f"🐢 HTTP fast path: no JobPosting JSON-LD in {self.url}, using browser")
+                return False
+            if not (self.get_title(soup, json_ld) and json_ld.get("description") and self.get_location(soup, json_ld)):
+                logger.info(f"🐢 HTTP fast path: missing title/description/location in {self.url}, using browser")
+                return False
+            # Same open-posting check as validate() in the browser: the apply button is on the page
+            if soup.find("button") is None:
+                logger.info(f"🐢 HTTP fast path: no apply button in the server HTML of {self.url}, using browser")
+                return False
+            if self.posting_expired(json_ld):
+                logger.info(f"🐢 HTTP fast path: JobPosting validThrough has passed for {self.url}, using browser")
+                return False
+        except Exception as e:
+            logger.warning(f"🐢 HTTP fast path failed for {self.url}: {e}")
+            return False
+
+        logger.info(f"⚡ HTTP fast path: using server HTML for {self.url}")
+        self.snapshot = PageSnapshot(response.url, response.text, soup, json_ld, source="http")
         return True
 
+    @staticmethod
+    def posting_expired(json_ld: dict) -> bool:
+        """The JobPosting's validThrough date (if any) is in the past."""
+        valid_through = json_ld.get("validThrough")
+        if not valid_through:
+            return False
+        try:
+            expires = datetime.fromisoformat(str(valid_through).replace("Z", "+00:00"))
+        except ValueError:
+            return False
+        if expires.tzinfo is None:
+            expires = pytz.utc.localize(expires)
+        return expires < datetime.now(pytz.utc)
+
+    def capture_snapshot(self, navigate: bool = False) -> PageSnapshot:
+        """
+        Snapshot the page currently loaded in the driver (final URL, parsed soup and JSON-LD).
+        In "script" extraction mode only the fields the extractors read come back from the page,
+        the full source is pulled later if the GPT fallback needs it.
+        Args:
+            navigate (bool): Load self.url first (when validate() didn't run on this driver).
+        """
+        if navigate:
+            with stage_timer("render"):
+                self.driver.get(self.url)
+                record_rendered_pages(self.driver)
+        if settings.COMEET_EXTRACTION_MODE == "script":
+            try:
+                with stage_timer("render"):
+                    payload = self.driver.execute_script(
+                        EXTRACTION_SCRIPT, RESPONSIBILITY_KEYWORDS + REQUIREMENT_KEYWORDS
+                    )
+                soup = make_soup(self.build_extract_html(payload))
+                self.snapshot = PageSnapshot(
+                    payload.get("final_url") or self.driver.current_url, None, soup, self.extract_json_ld(soup),
+                    source="browser", page_source_loader=lambda: self.driver.page_source,
+                )
+                return self.snapshot
+            except Exception as e:
+                logger.warning(f"⚠️ Extraction script failed for {self.url}, using page_source: {e}")
+
+        with stage_timer("render"):
+            html = self.driver.page_source
+        soup = make_soup(html)
+        self.snapshot = PageSnapshot(self.driver.current_url, html, soup, self.extract_json_ld(soup), source="browser")
+        return self.snapshot
+
+    @staticmethod
+    def build_extract_html(payload: dict) -> str:
+        """
+        Rebuild a small HTML document from the EXTRACTION_SCRIPT payload, laid out so the
+        regular extractors (get_title, get_location, get_responsibilities...) find the same things
+        they would in the full page.
+        """
+        escape = html_lib.escape
+        parts = [f'<script type="application/ld+json">{raw}</script>' for raw in payload.get("json_ld") or []]
+        if payload.get("h1"):
+            parts.append(f"<h1>{escape(payload['h1'])}</h1>")
+        if payload.get("h2"):
+            parts.append(f"<h2>{escape(payload['h2'])}</h2>")
+
+        marker = '<i class="fa fa-map-marker"></i>'
+        if payload.get("position_locations"):
+            items = "".join(f"<li>{marker}{escape(text)}</li>" for text in payload["position_locations"])
+            parts.append(f'<ul class="positionDetails">{items}</ul>')
+        if payload.get("location"):
+            parts.append(f'<div class="location">{escape(payload["location"])}</div>')
+        if payload.get("marker_locations"):
+            items = "".join(f"<li>{marker}{escape(text)}</li>" for text in payload["marker_locations"])
+            parts.append(f"<ul>{items}</ul>")
+        if payload.get("subheader"):
+            parts.append(f'<div class="careerHeroHeader__subheader"><span>{escape(payload["subheader"])}</span></div>')
+        if payload.get("description"):
+            parts.append(payload["description"])
+
+        for section in payload.get("sections") or []:
+            tag = section["tag"]
+            heading = f"<{tag}>{escape(section['text'])}</{tag}>"
+            if section.get("in_p"):
+                # A browser closes <p> before any <ul>/<div>, so only the paragraph's siblings matter
+                parts.append(f"<section><p>{heading}</p>{section.get('container_next_ul') or ''}</section>")
+            else:
+                siblings = (section.get("next_ul") or "") + (section.get("next_div") or "")
+                parts.append(f"<section>{heading}{siblings}</section>")
+        return "<html><body>" + "".join(parts) + "</body></html>"
+
     def set_driver(self, driver: WebDriver):
         self.driver = driver
         self.wait = WebDriverWait(driver, WAIT_TIME_TO_LOAD_PAGE)
@@ -69,19 +272,22 @@ class ComeetValidator(BaseValidator):
             logger.error(f"Error cleaning HTML with bleach: {e}")
             return html  # Fallback: return original HTML if cleaning fails
 
-    def _init_driver(self):
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--ignore-certificate-errors")
-        return webdriver.Chrome(options=options)
+    @staticmethod
+    def _init_driver():
+        return create_chrome_driver()
+
+    def use_preloaded_page(self, timed_out: bool = False) -> None:
+        """
+        The driver is already on this job's page (loaded by ComeetTabRenderer),
+        validate() should not navigate again.
+        """
+        self.page_preloaded = True
+        self.preload_timed_out = timed_out
 
     def is_page_full_loaded(self):
         try:
             self.driver.get(self.url)
+            record_rendered_pages(self.driver)
             self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".careerHeroHeader h1")))
             return True
         except Exception:
@@ -93,12 +299,21 @@ class ComeetValidator(BaseValidator):
         Returns True if a real job is detected, False otherwise.
         Sets error_reason and job_status accordingly.
         """
+        if self.snapshot and self.snapshot.source == "http":
+            # Server HTML already has an open JobPosting with an apply button, not a company page (try_http_fast_path)
+            return True
+
         try:
-            self.driver.get(self.url)
-            # Wait for job title or apply button
-            self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "button")) #h1, button
-            )
+            with stage_timer("render"):
+                if not self.page_preloaded:
+                    self.driver.get(self.url)
+                    record_rendered_pages(self.driver)
+                if self.preload_timed_out:
+                    raise TimeoutException("Tab did not load the job page in time")
+                # Wait for job title or apply button
+                self.wait.until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "button")) #h1, button
+                )
         except TimeoutException:
               # ✅ Check if the current URL is a generic company page (e.g., /jobs/wiz)
             if self.url_is_company_page(self.driver.current_url):
@@ -117,11 +332,14 @@ class ComeetValidator(BaseValidator):
             self.error_reason = f"Comeet Validation error: {e}"
             return False
         
+        # Page is loaded: keep it for extract_metadata() instead of loading it again
+        snapshot = self.capture_snapshot()
+
         # Step 4: If button appeared, still confirm it's not a company page
-        if self.url_is_company_page(self.driver.current_url):
+        if self.url_is_company_page(snapshot.final_url):
             self.job_status = "company page"
             self.error_reason = "Comeet company page detected"
-            logger.warning(f"❌ Comeet company page detected (normal): original url: {self.url} driver url after open page --> {self.driver.current_url}")
+            logger.warning(f"❌ Comeet company page detected (normal): original url: {self.url} driver url after open page --> {snapshot.final_url}")
             return False
         
         return True
@@ -130,29 +348,16 @@ class ComeetValidator(BaseValidator):
     def normalize_location(self, location_str: str) -> str:
         """
         Normalize raw location strings to consistent form.
+        Known Israeli localities come from the gazetteer index (e.g. "Petach Tikva" → "Petah Tikva, Israel").
      """
-        location_str = location_str.strip().lower()
-
-        # Common known city mappings
-        known_locations = {
-            "tel aviv": "Tel Aviv, Israel",
-            "herzliya": "Herzliya, Israel",
-            "jerusalem": "Jerusalem, Israel",
-            "haifa": "Haifa, Israel",
-            "petah tikva": "Petah Tikva, Israel",
-            "rishon lezion": "Rishon LeZion, Israel",
-            "beer sheva": "Beer Sheva, Israel",
-            "kfar saba": "Kfar Saba, Israel",
-            "netanya": "Netanya, Israel",
-            "israel": "Israel",
-        }
-
-        for key, value in known_locations.items():
-            if key in location_str:
-                return value
+        locality = find_locality(location_str)
+        if locality == "Israel":
+            return "Israel"
+        if locality:
+            return f"{locality}, Israel"
 
         # Default: capitalize first letters
-        return location_str.title()
+        return location_str.strip().lower().title()
 
 
     def extract_json_ld(self,soup):
@@ -187,18 +392,24 @@ class ComeetValidator(BaseValidator):
             logger.error(f"Error extracting JSON-LD: {e}")
             return {}
 
+    def page_index(self, soup) -> ComeetPageIndex:
+        """Section index of the soup, built in one walk and reused by all field getters."""
+        if self._page_index is None or self._page_index_soup is not soup:
+            self._page_index = ComeetPageIndex(soup)
+            self._page_index_soup = soup
+        return self._page_index
+
     def get_title(self,soup, json_ld):
         """
         Extracts the job title from JSON-LD or HTML.
         """
         if json_ld and json_ld.get("title"):
             return json_ld.get("title")
-        title_tag = soup.find("h1")
-        if title_tag:
-            return title_tag.get_text(strip=True)
-        h2 = soup.find("h2")
-        if h2:
-            return h2.get_text(strip=True)
+        index = self.page_index(soup)
+        if index.h1:
+            return index.h1.get_text(strip=True)
+        if index.h2:
+            return index.h2.get_text(strip=True)
         return None
     #
 
@@ -229,28 +440,19 @@ class ComeetValidator(BaseValidator):
         """
         
 
+        index = self.page_index(soup)
          # Try 2: positionDetails with icon
-        ul = soup.find("ul", class_="positionDetails")
-        if ul:
-            for li in ul.find_all("li"):
-                icon = li.find("i", class_="fa fa-map-marker")
-                if icon:
-                    return li.get_text(strip=True).replace(icon.get_text(strip=True), "").strip()
+        if index.position_locations:
+            return index.position_locations[0]
         # Fallback to HTML parsing
-        location_tag = soup.find("div", class_="location")
-        if location_tag:
-            return location_tag.get_text(strip=True)
+        if index.location_div:
+            return index.location_div.get_text(strip=True)
         # Try 3: Search full page for "fa-map-marker"
-        for icon in soup.find_all("i", class_="fa fa-map-marker"):
-            li = icon.find_parent("li")
-            if li:
-                return li.get_text(strip=True).replace(icon.get_text(strip=True), "").strip()
-
-        subheader = soup.find("div", class_="careerHeroHeader__subheader")
-        if subheader:
-            spans = subheader.find_all("span")
-        if spans:
-            location_text = spans[0].get_text(strip=True)
+        if index.marker_locations:
+            return index.marker_locations[0]
+
+        if index.subheader_span:
+            location_text = index.subheader_span.get_text(strip=True)
             return location_text
         if json_ld:
             job_location = json_ld.get("jobLocation", {})
@@ -275,16 +477,14 @@ class ComeetValidator(BaseValidator):
         return None
 
     def get_section_by_keywords(self,soup, keywords):
-        for tag in soup.find_all(["h2", "h3", "strong", "b"]):
-            text = tag.get_text(strip=True).lower()
-            if any(k in text for k in keywords):
-                ul = tag.find_next_sibling("ul")
-                if ul:
-                    return [li.get_text(strip=True) for li in ul.find_all("li")]
-                div = tag.find_next_sibling("div")
-                if div:
-                    # return div.get_text(strip=True)
-                    return div #return raw html
+        for heading in self.page_index(soup).headings_matching(keywords):
+            ul = heading.next_sibling("ul")
+            if ul:
+                return [li.get_text(strip=True) for li in ul.find_all("li")]
+            div = heading.next_sibling("div")
+            if div:
+                # return div.get_text(strip=True)
+                return div #return raw html
         return None
 
     def extract_text_from_gpt(self, html_for_gpt: str) -> dict:
@@ -368,7 +568,7 @@ class ComeetValidator(BaseValidator):
                 return cleaned_description.strip() or description
                 return BeautifulSoup(description, "html.parser").get_text(separator="\n", strip=True)
         # Fallback to HTML parsing
-        description_section = soup.find("div", class_="description")
+        description_section = self.page_index(soup).description_div
         if description_section:
             return description_section.get_text(separator="\n", strip=True)
         return None
@@ -377,18 +577,15 @@ class ComeetValidator(BaseValidator):
         """
         Extracts the responsibilities section from HTML.
         """
-        responsibilities_heading = soup.find(
-            lambda tag: tag.name in ["h2", "h3", "strong", "b"] and "responsibilit" in tag.get_text(strip=True).lower()
-        )
+        responsibilities_heading = self.page_index(soup).find_heading("responsibilit")
         if responsibilities_heading:
             # If heading is within <p>, get that <p> and then find next <ul>
-            container = responsibilities_heading.find_parent("p") or responsibilities_heading 
-            ul = container.find_next_sibling("ul")
+            ul = responsibilities_heading.container_next_sibling("ul")
             if ul:
                 cleaned_resp = self.bleach_clean(ul)
                 return cleaned_resp or [li.get_text(strip=True) for li in ul.find_all("li")]
         # Fallback to text section scan
-        resp =  self.get_section_by_keywords(soup, ["responsibilit", "what you'll do", "you will do"])
+        resp =  self.get_section_by_keywords(soup, RESPONSIBILITY_KEYWORDS)
         if resp:
             cleaned_resp = self.bleach_clean(resp)
             return cleaned_resp.strip() or resp
@@ -399,21 +596,20 @@ class ComeetValidator(BaseValidator):
         Extracts the requirements section from HTML.
         """
         
-        requirements_heading = soup.find(lambda tag: tag.name in ["h2", "h3"] and "requirements" in tag.get_text(strip=True).lower())
+        requirements_heading = self.page_index(soup).find_heading("requirements", tags=("h2", "h3"))
         if requirements_heading:
-            ul = requirements_heading.find_next_sibling("ul")
+            ul = requirements_heading.next_sibling("ul")
             if ul:
                 return [li.get_text(strip=True) for li in ul.find_all("li")]
         # return self.get_section_by_keywords(soup, ["requirement", "qualifications", "experience"])
-        requirements_heading = self.get_section_by_keywords(soup, ["requirement", "qualifications", "experience"])
+        requirements_heading = self.get_section_by_keywords(soup, REQUIREMENT_KEYWORDS)
         return self.bleach_clean(requirements_heading) or requirements_heading
     def plain_text(self,html):
         return BeautifulSoup(html or "", "html.parser").get_text(separator=" ", strip=True).lower()
     def extract_metadata(self) -> dict:
-        self.driver.get(self.url)  # ✅ self.url is passed in the constructor
-        html = self.driver.page_source
-        soup = BeautifulSoup(html, "html.parser")
-        json_ld = self.extract_json_ld(soup)
+        # ✅ Page fetched once by validate() (or the HTTP fast path), load it only if validate() didn't run
+        snapshot = self.snapshot or self.capture_snapshot(navigate=True)
+        soup, json_ld = snapshot.soup, snapshot.json_ld
 
         # Step 1: Try all structured extractors
         title = self.get_title(soup, json_ld)
@@ -441,6 +637,8 @@ class ComeetValidator(BaseValidator):
             special_notes += "\n- 'Responsibilities' may appear under 'What you'll do', 'Your day-to-day', etc."
 
         if missing_fields:
+            # GPT needs the whole page: only now pull the full source if the snapshot is a compact extract
+            html = snapshot.page_source
             prompt = f"""
             From the following HTML, extract ONLY the following fields: {', '.join(missing_fields)}.
             Respond in JSON with exactly those keys.
@@ -455,8 +653,9 @@ class ComeetValidator(BaseValidator):
             # visible_text_only = self.get_visible_html_text(soup)
 
             # Use full structured HTML for GPT, fallback to main section if available
-            main = soup.find("div", class_="company-description")
-            html_for_gpt = str(main) if main else str(soup)
+            full_soup = snapshot.full_soup
+            main = full_soup.find("div", class_="company-description")
+            html_for_gpt = str(main) if main else str(full_soup)
                 
             gpt_result = gpt_extract_job_metadata_from_html(html_for_gpt, prompt)
             usage = gpt_result.get("usage")
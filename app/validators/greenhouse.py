@@ -1,18 +1,28 @@
 from typing import Any, Dict, Optional, Tuple
-import requests
+import asyncio
+import json
+import aiohttp
 from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
-import bleach
 from urllib.parse import urlparse, parse_qs
-from html import unescape
 
 from app.validators.base import BaseValidator
 from app.log_config import logger
 from app.services.gpt_fallback import gpt_extract_job_metadata_from_html
 from app.utils.location_utils import is_location_in_israel  # To be added in Step 2
+from app.utils.html_cleaning import clean_job_html, plain_text
+from app.utils.rate_limiter import limited_get, limited_head, record_response, upstream_slot_async
+from app.services.source_fingerprints import SourceFingerprint, conditional_headers, content_hash
+from app.utils.metrics import stage_timer, validator_context
+from app.utils.job_timeline import record_http_call, timeline_context
 
 
+GREENHOUSE_API_BASE_URL = "https://boards-api.greenhouse.io/v1/boards"
+ALLOWED_TAGS = ["p", "ul", "ol", "li", "b", "strong", "em", "br"]
+# Posting fields whose change requires a full revalidation (same in the single-job API and the board listing)
+FINGERPRINT_FIELDS = ("title", "content", "location", "updated_at", "absolute_url")
+
 
 class GreenhouseValidator(BaseValidator):
     def __init__(self, url: str) -> None:
@@ -22,13 +32,20 @@ class GreenhouseValidator(BaseValidator):
 
         self.job_json: Optional[Dict[str,Any]] = None
         self.soup = None
+        self.closed_in_board_listing = False  # Set when a board listing was applied and the job is not in it
+        self.prefetched = False  # Set by prefetch_async(), validate() then makes no blocking requests
+        self.location_verdict: Optional[Tuple[Optional[str], bool]] = None  # (location, is_in_israel) from prefetch
+        self.embed_url_checked = False
+        self.previous_fingerprint: Optional[SourceFingerprint] = None  # Stored at the last validation, set by the service
+        self.fingerprint: Optional[SourceFingerprint] = None  # Of the posting as fetched now
+        self.unchanged = False  # 304 Not Modified or same content hash as previous_fingerprint
         self.api_url = self._build_api_url_from_board_token_and_job_id()
 
 
     
     
     def _load_page(self):
-        response = requests.get(self.url, timeout=10)
+        response = limited_get(self.url, timeout=10)
         if response.status_code != 200:
             return False
         self.soup = BeautifulSoup(response.text, "html.parser")
@@ -46,7 +63,7 @@ class GreenhouseValidator(BaseValidator):
         if board_token and job_id:
             upgraded_url = f"https://boards.greenhouse.io/{board_token}/jobs/{job_id}"
             try:
-                resp = requests.head(upgraded_url, timeout=5)
+                resp = limited_head(upgraded_url, timeout=5)
                 if resp.status_code in [200, 302]:
                     logger.info(f"{self.log_prefix()} - ✅ Upgraded embed URL → {upgraded_url}")
                     self.url = upgraded_url
@@ -136,6 +153,54 @@ class GreenhouseValidator(BaseValidator):
             logger.error(f"{self.log_prefix()} - Error parsing job link: {e}")
             return None, None
     
+    def get_board_token(self) -> Optional[str]:
+        """Board token of this job (e.g. "yotpo"), or None if it can't be parsed from the URL."""
+        board_token, _ = self._parse_board_and_job_id_from_self_url()
+        if board_token and board_token.lower() == "embed":
+            return None
+        return board_token
+
+    @staticmethod
+    def fetch_board_listing(board_token: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Fetch the full job listing of a Greenhouse board (with content) in a single request.
+        Returns a dict of job_id (str) → job json, or None if the listing could not be loaded.
+        Example:
+        https://boards-api.greenhouse.io/v1/boards/yotpo/jobs?content=true
+        """
+        listing_url = f"{GREENHOUSE_API_BASE_URL}/{board_token}/jobs"
+        try:
+            with stage_timer("fetch", "GreenhouseValidator"):
+                response = limited_get(listing_url, params={"content": "true"}, timeout=15)
+            if response.status_code != 200:
+                logger.warning(f"❌ Greenhouse board listing failed [{response.status_code}]: {listing_url}")
+                return None
+            jobs = response.json().get("jobs") or []
+            logger.info(f"📋 Loaded {len(jobs)} jobs from Greenhouse board '{board_token}'")
+            return {str(job["id"]): job for job in jobs if job.get("id") is not None}
+        except Exception as e:
+            logger.error(f"Error loading Greenhouse board listing {listing_url}: {e}")
+            return None
+
+    def apply_board_listing(self, listing: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Use a board listing (see fetch_board_listing) instead of the per-job API call.
+        If the job is not in the listing it is closed, and validate() will fail without any request.
+        If the job id can't be parsed from the URL the validator is left as is (validate() uses the per-job API).
+        Returns True if the job was found in the listing.
+        """
+        _, job_id = self._parse_board_and_job_id_from_self_url()
+        if not job_id:
+            return False
+        job_json = listing.get(str(job_id))
+        if job_json:
+            self.job_json = job_json
+            self._record_fingerprint()
+            return True
+        self.job_json = None
+        self.closed_in_board_listing = True
+        return False
+
     def _load_json_api(self) -> bool:
         """
             Load the job data from the Greenhouse JSON API.
@@ -155,40 +220,156 @@ class GreenhouseValidator(BaseValidator):
             self.error_reason = "missing api url Failed to parse board_token or job_id from URL"
             return False
         try:
-            response = requests.get(self.api_url, timeout=7)
-            self.job_json = response.json()
-            if response.status_code == 404 or self.job_json.get("error") == "job not found":
-                logger.warning(f"❌ Greenhouse job not found (404): {self.api_url}")
-                self.error_reason = "Job not found (404 from API)"
-                self.job_json = None  # Ensure consistency
-                self.job_status = "validation failed"
-                return False
-
-            return True
+            with stage_timer("fetch"):
+                response = limited_get(self.api_url, timeout=7, headers=conditional_headers(self.previous_fingerprint))
+            if response.status_code == 304:
+                return self._mark_not_modified()
+            return self._apply_api_response(response.status_code, response.json(), response.headers)
         except Exception as e:
             logger.error(f"{self.log_prefix()} - e {e}")
             return False
+
+    def _apply_api_response(self, status_code: int, job_json: Dict[str, Any], headers=None) -> bool:
+        """
+        Store the JSON API response (and the fingerprint of the posting) on the validator.
+        Returns False (and sets job_status/error_reason) if the job was not found.
+        """
+        self.job_json = job_json
+        if status_code == 404 or self.job_json.get("error") == "job not found":
+            logger.warning(f"❌ Greenhouse job not found (404): {self.api_url}")
+            self.error_reason = "Job not found (404 from API)"
+            self.job_json = None  # Ensure consistency
+            self.job_status = "validation failed"
+            return False
+        headers = headers or {}
+        self._record_fingerprint(headers.get("ETag"), headers.get("Last-Modified"))
+        return True
+
+    def _record_fingerprint(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Fingerprint the loaded job_json and compare it with previous_fingerprint.
+        Without new ETag / Last-Modified values (e.g. from a board listing) the previous ones are kept.
+        """
+        previous = self.previous_fingerprint or SourceFingerprint()
+        self.fingerprint = SourceFingerprint(
+            etag or previous.etag,
+            last_modified or previous.last_modified,
+            content_hash(self.job_json, FINGERPRINT_FIELDS),
+        )
+        self.unchanged = previous.content_hash is not None and previous.content_hash == self.fingerprint.content_hash
+
+    def _mark_not_modified(self) -> bool:
+        """The API answered 304 Not Modified to our conditional request."""
+        logger.info(f"♻️ Greenhouse job not modified (304): {self.api_url}")
+        self.fingerprint = self.previous_fingerprint
+        self.unchanged = True
+        return True
+
+    async def prefetch_async(self, session: aiohttp.ClientSession, geo_semaphore: asyncio.Semaphore) -> None:
+        """
+        Run all the network work of validate() and extract_metadata() on the event loop:
+        the JSON API call, the location lookup and the embed URL upgrade.
+        After this, validate() and extract_metadata() don't make any blocking request.
+        Args:
+            session (aiohttp.ClientSession): Shared session (holds the connection limits).
+            geo_semaphore (asyncio.Semaphore): Limits concurrent location lookups (OpenCage / GPT).
+        """
+        # Task-local, copied into to_thread(): stage metrics and the timeline are attributed to this job
+        with validator_context(type(self).__name__), timeline_context(self.timeline):
+            await self._prefetch_async(session, geo_semaphore)
+
+    async def _prefetch_async(self, session: aiohttp.ClientSession, geo_semaphore: asyncio.Semaphore) -> None:
+        self.prefetched = True
+        if self.closed_in_board_listing or not self.api_url:
+            return
+
+        if self.job_json is None:
+            try:
+                headers = conditional_headers(self.previous_fingerprint)
+                with stage_timer("fetch"):
+                    async with upstream_slot_async("greenhouse") as slot, \
+                            session.get(self.api_url, headers=headers) as response:
+                        record_response(slot, response.status, response.headers)
+                        body = await response.read()
+                record_http_call(len(body))
+                job_json = None if response.status == 304 else json.loads(body)
+                if response.status == 304:
+                    self._mark_not_modified()
+                elif not self._apply_api_response(response.status, job_json, response.headers):
+                    return
+            except Exception as e:
+                logger.error(f"{self.log_prefix()} - async API call failed: {e}")
+                return
+
+        if self.unchanged:
+            # Nothing to check again: validate() skips the location lookup and the embed upgrade
+            self.embed_url_checked = True
+            return
+
+        location = (self.job_json.get("location") or {}).get("name")
+        async with geo_semaphore:
+            # location_utils is sync (OpenCage + GPT fallback), run it off the event loop
+            is_in_israel = await asyncio.to_thread(is_location_in_israel, location)
+        self.location_verdict = (location, is_in_israel)
+
+        await self._replace_embed_url_if_needed_async(session)
+
+    async def _replace_embed_url_if_needed_async(self, session: aiohttp.ClientSession) -> None:
+        """Async version of replace_embed_url_if_needed()."""
+        if not self.job_json or "embed" not in self.url:
+            self.embed_url_checked = True
+            return
+
+        board_token, job_id = self._parse_board_and_job_id_from_self_url()
+        if board_token and job_id:
+            upgraded_url = f"https://boards.greenhouse.io/{board_token}/jobs/{job_id}"
+            try:
+                async with upstream_slot_async("greenhouse") as slot, \
+                        session.head(upgraded_url, allow_redirects=True) as resp:
+                    record_response(slot, resp.status, resp.headers)
+                    record_http_call(0)
+                    if resp.status == 200:
+                        logger.info(f"{self.url} - ✅ Replaced embed URL → {upgraded_url}")
+                        self.url = upgraded_url
+                        self.embed_url_checked = True
+                        return
+                    logger.warning(f" ❌ Canonical URL not reachable: {upgraded_url} [{resp.status}]")
+            except Exception as e:
+                logger.error(f"{self.log_prefix()} - Exception checking canonical URL: {upgraded_url} → {e}")
+
+        absolute_url = self.job_json.get("absolute_url")
+        if absolute_url and absolute_url != self.url:
+            logger.info(f" - ⚠️ Falling back to absolute_url → {absolute_url}")
+            self.url = absolute_url
+        self.embed_url_checked = True
         
     def bleach_clean(self, html: Optional[str]) -> str:
         """
         Clean and sanitize HTML content.
         """
-        return bleach.clean(
-            html or "",
-            tags=["p", "ul", "ol", "li", "b", "strong", "em", "br"],
-            attributes={},
-            strip=True,
-        )
+        return clean_job_html(html or "", ALLOWED_TAGS).html
     #TODO:##need to think if need to return the error like is not in israel of company page
     def validate(self) -> bool:
         """
         Check if job is valid and located in Israel.
         """
-        if not self._load_json_api():
+        if self.closed_in_board_listing:
+            logger.warning(f"❌ Greenhouse job missing from board listing (closed): {self.url}")
+            self.job_status = "closed"
+            self.error_reason = "Job not found in Greenhouse board listing"
+            return False
+
+        # job_json may already be loaded from a board listing (bulk mode) or by prefetch_async()
+        if self.job_json is None and not self.unchanged and (self.prefetched or not self._load_json_api()):
             logger.warning(f"❌ Failed to load Greenhouse JSON API: {self.api_url}")
 
             return False
 
+        if self.unchanged:
+            # Same posting as at the last successful validation: content and location were already checked
+            logger.info(f"♻️ Greenhouse job unchanged since last validation: {self.url}")
+            return True
+
         content = self.job_json.get("content", "")
         if not content or "<html>" in content.lower():  # heuristic for redirect
             logger.warning(f"❌ Invalid job content or likely redirect: {self.url}")
@@ -197,7 +378,11 @@ class GreenhouseValidator(BaseValidator):
             return False
         #TODO: Check if job is still open
         location = self.job_json.get("location", {}).get("name")
-        if not is_location_in_israel(location):
+        if self.location_verdict and self.location_verdict[0] == location:
+            is_in_israel = self.location_verdict[1]
+        else:
+            is_in_israel = is_location_in_israel(location)
+        if not is_in_israel:
             self.error_reason = f"Job location '{location}' is not in Israel"
             self.job_status = "validation failed"
             logger.warning(f"❌ Location not in Israel: {location}")
@@ -205,16 +390,6 @@ class GreenhouseValidator(BaseValidator):
 
         return True
 
-    def strip_ms_spans(self, html_str: str) -> str:
-        """
-        Unwrap Microsoft Word-style <span> elements from the HTML.
-        """
-        soup = BeautifulSoup(html_str, "html.parser")
-        for span in soup.find_all("span"):
-            if span.get("class") and any("TextRun" in cls or "ccp" in cls for cls in span["class"]):
-                span.unwrap()
-        return str(soup)
-    
     def replace_embed_url_if_needed(self) -> None:
         """
         Upgrade embed URL to stable Greenhouse format if available and valid.
@@ -234,7 +409,7 @@ class GreenhouseValidator(BaseValidator):
         3. Updates self.url only if needed.
         """
         
-        if not self.job_json or "embed" not in self.url:
+        if self.embed_url_checked or not self.job_json or "embed" not in self.url:
             return
         
         board_token, job_id,  = self._parse_board_and_job_id_from_self_url()
@@ -243,7 +418,7 @@ class GreenhouseValidator(BaseValidator):
         if board_token and job_id:
             upgraded_url = f"https://boards.greenhouse.io/{board_token}/jobs/{job_id}"
             try:
-                resp = requests.head(upgraded_url, timeout=5,allow_redirects=True)
+                resp = limited_head(upgraded_url, timeout=5,allow_redirects=True)
                 # Use HEAD request to check if the URL is reachable
                 if resp.status_code == 200:
                     logger.info(f"{self.url} - ✅ Replaced embed URL → {upgraded_url}")
@@ -269,16 +444,10 @@ class GreenhouseValidator(BaseValidator):
 
         job = self.job_json or {}
 
-        # 🧼 Clean and sanitize HTML content
-        # Step 1: Decode HTML-escaped content
-        raw_html = unescape(job.get("content", ""))
-
-        # Step 2: Remove Microsoft Word garbage spans
-        cleaned_html = self.strip_ms_spans(raw_html)
-
-        # Step 3: Final sanitization using bleach (for DB or UI display)
-        # description: str = self.bleach_clean(job.get("content", ""))
-        description: str = self.bleach_clean(cleaned_html)
+        # 🧼 Clean and sanitize HTML content in one pass (memoized by content hash):
+        # decode HTML-escaped content, unwrap Microsoft Word spans, keep only ALLOWED_TAGS, plain text
+        cleaned = clean_job_html(job.get("content", ""), ALLOWED_TAGS, unescape_first=True)
+        description: str = cleaned.html
         description_html: Optional[str] = job.get("content")
 
         title_raw = job.get("title", "")
@@ -339,11 +508,7 @@ class GreenhouseValidator(BaseValidator):
          # 🧼 Step 2: Remove duplication (responsibilities or requirements inside description)
         
         #TODO:CHECK HERE
-        def plain_text(html: str) -> str:
-            from bs4 import BeautifulSoup
-            return BeautifulSoup(html or "", "html.parser").get_text(separator=" ", strip=True).lower()
-
-        desc_text = plain_text(metadata["description"] or "")
+        desc_text = cleaned.text.lower()
         resp_text = plain_text(metadata["responsibilities"] or "")
         reqs_text = plain_text(metadata["requirements"] or "")
 
@@ -414,7 +579,7 @@ class GreenhouseValidator(BaseValidator):
             board_name, job_id = self._parse_board_and_job_id_from_self_url()
             if ("embed" in board_name or board_name is None):
                 #get company name 
-                response = requests.get(self.url, timeout=7)
+                response = limited_get(self.url, timeout=7)
             if response.status_code == 404 or response.json().get("error") == "job not found":
                 logger.warning(f"❌ Greenhouse job not found (404): {self.api_url}")
                 return None
@@ -0,0 +1,46 @@
+from typing import Any, Callable, Dict, Optional
+
+from bs4 import BeautifulSoup
+
+from app.utils.html_utils import make_soup
+
+
+class PageSnapshot:
+    """
+    A job page as fetched once by a validator, shared by validate() and extract_metadata()
+    so the page is not loaded (or parsed) twice.
+
+    The soup may be a compact extract of the page (see ComeetValidator.capture_snapshot),
+    in that case the full source is only fetched through page_source_loader when read.
+    """
+
+    def __init__(self, final_url: str, page_source: Optional[str], soup: BeautifulSoup,
+                 json_ld: Optional[Dict[str, Any]], source: str,
+                 page_source_loader: Optional[Callable[[], str]] = None):
+        self.final_url = final_url  # URL after redirects
+        self._page_source = page_source
+        self._page_source_loader = page_source_loader
+        self._full_soup: Optional[BeautifulSoup] = None
+        self.soup = soup
+        self.json_ld = json_ld
+        self.source = source  # "http" (plain fetch) or "browser" (Selenium)
+
+    @property
+    def is_partial(self) -> bool:
+        """True when soup holds only the extracted fields, not the whole page."""
+        return self._page_source_loader is not None
+
+    @property
+    def page_source(self) -> str:
+        if self._page_source is None:
+            self._page_source = self._page_source_loader() if self._page_source_loader else ""
+        return self._page_source
+
+    @property
+    def full_soup(self) -> BeautifulSoup:
+        """Soup of the whole page (parsed on first use for partial snapshots)."""
+        if not self.is_partial:
+            return self.soup
+        if self._full_soup is None:
+            self._full_soup = make_soup(self.page_source)
+        return self._full_soup
@@ -0,0 +1,32 @@
+import warnings
+
+from fastapi.testclient import TestClient
+from starlette.exceptions import StarletteDeprecationWarning
+
+from app import main
+from app.config import settings
+
+
+def test_lifespan_starts_and_stops(monkeypatch):
+    # No browsers or background threads here: only the lifespan wiring is under test
+    monkeypatch.setattr(settings, "CHROME_POOL_SIZE", 0)
+    monkeypatch.setattr(settings, "REVALIDATION_ENABLED", False)
+    prepared = []
+    for check in ("job_leases_available", "source_fingerprints_available", "validation_timelines_available"):
+        monkeypatch.setattr(main, check, lambda check=check: prepared.append(check))
+    monkeypatch.setattr(main, "warm_location_cache", lambda: None)
+
+    # A misplaced decorator turns lifespan into a bare async generator and makes
+    # prepare_optional_columns return an unused context manager
+    assert hasattr(main.lifespan(main.app), "__aenter__")
+    assert main.prepare_optional_columns() is None
+    prepared.clear()
+
+    with warnings.catch_warnings():
+        # Starlette only accepts an undecorated async generator lifespan through a deprecated shim
+        warnings.simplefilter("error", StarletteDeprecationWarning)
+        with TestClient(main.app) as client:
+            assert client.get("/").status_code == 200
+            assert main.app.state.run_manager is not None
+
+    assert prepared == ["job_leases_available", "source_fingerprints_available", "validation_timelines_available"]
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.async_greenhouse import iterate_in_event_loop
+
+
+async def timed_items(count, delay):
+    started = time.monotonic()
+    for index in range(count):
+        await asyncio.sleep(delay)
+        yield index, time.monotonic() - started
+
+
+def test_iterator_keeps_running_while_the_caller_blocks():
+    finished_at = []
+    for index, elapsed in iterate_in_event_loop(timed_items(3, 0.1)):
+        finished_at.append(elapsed)
+        time.sleep(0.3)  # Blocking work between items (GPT, DB) must not pause the loop
+
+    # Paused between items, the last one would only finish after ~0.9s
+    assert finished_at[-1] < 0.6
+
+
+def test_errors_reach_the_caller():
+    async def failing():
+        yield 1
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        list(iterate_in_event_loop(failing()))
+
+
+def test_closing_early_cancels_the_iterator():
+    closed = []
+
+    async def endless():
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield 1
+        finally:
+            closed.append(True)
+
+    items = iterate_in_event_loop(endless())
+    assert next(items) == 1
+    items.close()
+    assert closed == [True]
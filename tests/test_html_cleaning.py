@@ -0,0 +1,68 @@
+import re
+from html import unescape
+
+import bleach
+import pytest
+from bs4 import BeautifulSoup
+
+from app.utils.html_cleaning import clean_job_html
+from app.validators.greenhouse import ALLOWED_TAGS
+
+# Job "content" as the Greenhouse API returns it: HTML-escaped, with intro/conclusion divs,
+# headings, MS Word TextRun spans, &nbsp; paragraphs and nested lists
+GREENHOUSE_CONTENTS = [
+    "&lt;div class=&quot;content-intro&quot;&gt;&lt;p&gt;&lt;strong&gt;About Us&lt;/strong&gt;&lt;/p&gt;"
+    "&lt;p&gt;We build the data platform behind 2,000+ engineering teams.&lt;/p&gt;&lt;/div&gt;"
+    "&lt;h3&gt;&lt;strong&gt;What you&amp;#39;ll do&lt;/strong&gt;&lt;/h3&gt;"
+    "&lt;div&gt;Own services end to end, from design to on-call.&lt;/div&gt;"
+    "&lt;ul&gt;&lt;li&gt;Design APIs used by every product team&lt;/li&gt;"
+    "&lt;li&gt;Mentor engineers&amp;nbsp;across the org&lt;/li&gt;&lt;/ul&gt;"
+    "&lt;h3&gt;Requirements&lt;/h3&gt;&lt;div&gt;5+ years of Python&lt;/div&gt;"
+    "&lt;div&gt;Experience with Postgres &amp;amp; Kafka&lt;/div&gt;"
+    "&lt;div class=&quot;content-conclusion&quot;&gt;&lt;p&gt;&amp;nbsp;&lt;/p&gt;"
+    "&lt;p&gt;&lt;em&gt;Equal opportunity employer.&lt;/em&gt;&lt;/p&gt;&lt;/div&gt;",
+
+    "&lt;p&gt;&lt;span class=&quot;TextRun SCXW123 BCX0&quot; data-contrast=&quot;auto&quot;&gt;"
+    "&lt;span class=&quot;NormalTextRun SCXW123 BCX0&quot;&gt;Join our Tel Aviv R&amp;amp;D center&lt;/span&gt;"
+    "&lt;/span&gt;&lt;span class=&quot;EOP SCXW123&quot;&gt;&amp;nbsp;&lt;/span&gt;&lt;/p&gt;"
+    "&lt;h2&gt;Responsibilities&lt;/h2&gt;\n&lt;div&gt;&lt;span class=&quot;ccp&quot;&gt;Lead the backend guild&lt;/span&gt;"
+    "&lt;/div&gt;\n&lt;h2&gt;Qualifications&lt;/h2&gt;&lt;div&gt;&lt;ul&gt;&lt;li&gt;&lt;p&gt;B.Sc. in CS&lt;/p&gt;&lt;/li&gt;"
+    "&lt;li&gt;&lt;p&gt;Hebrew &amp;amp; English&lt;/p&gt;&lt;/li&gt;&lt;/ul&gt;&lt;/div&gt;"
+    "&lt;table&gt;&lt;tr&gt;&lt;td&gt;Location&lt;/td&gt;&lt;td&gt;Tel Aviv&lt;/td&gt;&lt;/tr&gt;&lt;/table&gt;",
+]
+
+
+def baseline_clean(content: str) -> str:
+    """The pipeline clean_job_html replaced: unescape, unwrap MS Word spans, bleach.clean."""
+    soup = BeautifulSoup(unescape(content), "html.parser")
+    for span in soup.find_all("span"):
+        if span.get("class") and any("TextRun" in cls or "ccp" in cls for cls in span["class"]):
+            span.unwrap()
+    return bleach.clean(str(soup), tags=ALLOWED_TAGS, attributes={}, strip=True)
+
+
+def normalized(html: str) -> str:
+    """Same markup up to entity spelling (&nbsp; vs \\xa0) and runs of whitespace."""
+    return re.sub(r"\s+", " ", unescape(html).replace("\xa0", " ")).strip()
+
+
+def text_lines(html: str):
+    """Text per line, separated the way a reader sees it (block boundaries keep their newline)."""
+    text = BeautifulSoup(html, "html.parser").get_text()
+    return [line.strip() for line in text.replace("\xa0", " ").splitlines() if line.strip()]
+
+
+@pytest.mark.parametrize("content", GREENHOUSE_CONTENTS)
+def test_clean_job_html_matches_baseline_pipeline(content):
+    expected = baseline_clean(content)
+    cleaned = clean_job_html(content, ALLOWED_TAGS, unescape_first=True)
+
+    assert normalized(cleaned.html) == normalized(expected)
+    assert text_lines(cleaned.html) == text_lines(expected)
+
+
+def test_unwrapped_blocks_keep_their_separation():
+    cleaned = clean_job_html("<h3>Requirements</h3><div>5+ years of Python</div>", ALLOWED_TAGS)
+
+    assert cleaned.html == "Requirements\n5+ years of Python"
+    assert cleaned.text == "Requirements 5+ years of Python"
@@ -0,0 +1,26 @@
+import pytest
+
+from app.utils.israel_gazetteer import classify_location, find_locality
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("Tel Aviv", True),
+    ("Jerusalem, Israel", True),
+    ("Haifa, IL", True),
+    ("Petach Tikva, Center District", True),
+    ("Berlin, Germany", False),
+    ("New York, NY", False),
+    # Ambiguous names alone, or Israeli names qualified by another country / US state: left to the geocoder
+    ("Arad", None),
+    ("Carmel, Indiana", None),
+    ("Nazareth, PA", None),
+    ("Omer, Nebraska", None),
+    ("Jerusalem, Ohio, United States", None),
+])
+def test_classify_location(location, expected):
+    assert classify_location(location) is expected
+
+
+def test_find_locality_ignores_foreign_qualified_names():
+    assert find_locality("Petach Tikva, Center District") == "Petah Tikva"
+    assert find_locality("Jerusalem, Ohio, United States") is None